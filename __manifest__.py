@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Hamarpea Voicenter Integration',
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.2.0',
     'category': 'VOIP',
     'summary': 'Integrate Voicenter VOIP call logs with Odoo CRM',
     'description': """
@@ -35,6 +35,16 @@
         'security/ir.model.access.csv',
         'data/ir_cron_data.xml',
         'views/voicenter_call_log_views.xml',
+        'views/voicenter_call_log_archive_views.xml',
+        'views/voicenter_call_stats_views.xml',
+        'views/voicenter_sync_state_views.xml',
+        'views/voicenter_sync_run_views.xml',
+        'views/voicenter_representative_views.xml',
+        'views/voicenter_dimension_views.xml',
+        'views/voicenter_cdr_queue_views.xml',
+        'views/voicenter_cdr_dead_letter_views.xml',
+        'views/voicenter_recording_pending_views.xml',
+        'views/voicenter_backfill_views.xml',
         'views/res_config_settings_views.xml',
         'views/res_partner_views.xml',
         'views/crm_lead_views.xml',
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Per-record create cost of voicenter.call.log, with and without the ingest fast path.
+
+Run inside an Odoo shell on a database with the module installed:
+
+    odoo-bin shell -d <db> < benchmarks/bench_call_log_create.py
+
+Every measurement runs in a savepoint that is rolled back; nothing is kept.
+"""
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from odoo.addons.hamarpea_odoo_voicenter.models.voicenter_call_log import INGEST_CONTEXT
+
+RECORD_COUNT = 500
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _call_vals_list(count):
+    now = datetime.now()
+    return [{
+        'call_id': f"bench-{uuid.uuid4()}",
+        'date': now - timedelta(seconds=index),
+        'caller_number': f"97250{index:07d}",
+        'target_number': '035555555',
+        'duration': index % 300,
+        'cdr_type': 1,
+        'dial_status': 'ANSWER' if index % 3 else 'NOANSWER',
+    } for index in range(count)]
+
+
+def _measure(label, create):
+    CallLog = env['voicenter.call.log']
+    vals_list = _call_vals_list(RECORD_COUNT)
+    result = {}
+    try:
+        with env.cr.savepoint():
+            env.flush_all()
+            queries_before = env.cr.sql_log_count
+            started = time.perf_counter()
+            create(CallLog, vals_list)
+            env.flush_all()
+            result['seconds'] = time.perf_counter() - started
+            result['queries'] = env.cr.sql_log_count - queries_before
+            raise _Rollback()
+    except _Rollback:
+        pass
+    env.invalidate_all()
+
+    print(f"{label:<40} {result['seconds'] * 1000 / RECORD_COUNT:8.2f} ms/record "
+          f"{result['queries'] / RECORD_COUNT:8.2f} queries/record")
+    return result
+
+
+print(f"voicenter.call.log create cost over {RECORD_COUNT} records")
+baseline = _measure(
+    "create() per record, full chatter",
+    lambda CallLog, vals_list: [CallLog.create(vals) for vals in vals_list])
+_measure(
+    "create(vals_list), full chatter",
+    lambda CallLog, vals_list: CallLog.create(vals_list))
+fast = _measure(
+    "create(vals_list), ingest context",
+    lambda CallLog, vals_list: CallLog.with_context(**INGEST_CONTEXT).create(vals_list))
+print(f"Speed-up of the ingest path: {baseline['seconds'] / fast['seconds']:.1f}x")
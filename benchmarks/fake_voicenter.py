@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""Local stand-in for the Voicenter ``hub/cdr`` endpoint.
+
+Generates a realistic CDR stream for whatever date range is requested.
+The calls of a given minute depend only on the seed and that minute, so
+fetching a range twice returns the same calls, just like the real API.
+
+Standalone:
+
+    python3 benchmarks/fake_voicenter.py --port 8765 --calls-per-hour 2000
+
+then point the ``voicenter.api_base_url`` system parameter at
+``http://127.0.0.1:8765``. run_benchmark.py starts it in-process instead.
+"""
+import argparse
+import gzip
+import json
+import logging
+import random
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_logger = logging.getLogger(__name__)
+
+# Known numbers are the ones run_benchmark.py seeds on partners and leads
+KNOWN_NUMBER_BASE = 501000000
+UNKNOWN_NUMBER_BASE = 529000000
+
+# (CdrType, weight): incoming, extension outgoing, queue, click2call leg
+DEFAULT_CDR_TYPE_MIX = ((1, 50), (4, 30), (8, 15), (9, 5))
+# (DialStatus, weight)
+DEFAULT_DIAL_STATUS_MIX = (
+    ('ANSWER', 60), ('NOANSWER', 20), ('CANCEL', 8), ('BUSY', 5),
+    ('VOICEMAIL', 4), ('ABANDONE', 3),
+)
+
+REPRESENTATIVES = [
+    (str(1000 + index), f"Representative {index}", f"rep{index}@example.com")
+    for index in range(20)
+]
+DEPARTMENTS = [(str(100 + index), f"Department {index}") for index in range(4)]
+QUEUES = ['Sales', 'Support', 'Billing', 'VIP']
+
+
+@dataclass
+class StreamConfig:
+    """Shape of the generated CDR stream"""
+    calls_per_hour: int = 1000
+    known_numbers: int = 1000
+    unknown_ratio: float = 0.2
+    duplicate_ratio: float = 0.05
+    recording_ratio: float = 0.5
+    cdr_type_mix: tuple = DEFAULT_CDR_TYPE_MIX
+    dial_status_mix: tuple = DEFAULT_DIAL_STATUS_MIX
+    seed: int = 42
+
+
+@dataclass
+class ServerStats:
+    """Counters of what the fake server has served"""
+    requests: int = 0
+    cdrs: int = 0
+    bytes: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, cdr_count, byte_count):
+        with self.lock:
+            self.requests += 1
+            self.cdrs += cdr_count
+            self.bytes += byte_count
+
+
+def known_number(index):
+    """Local format of the index-th known number, as seeded on partners/leads"""
+    return f"0{KNOWN_NUMBER_BASE + index}"
+
+
+def _weighted(rng, mix):
+    values, weights = zip(*mix)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _minute_cdrs(minute, config):
+    """CDRs of the minute starting at the given naive UTC datetime"""
+    rng = random.Random(f"{config.seed}-{minute:%Y%m%d%H%M}")
+    rate = config.calls_per_hour / 60.0
+    count = int(rate) + (1 if rng.random() < rate - int(rate) else 0)
+
+    cdrs = []
+    for index in range(count):
+        if config.known_numbers and rng.random() >= config.unknown_ratio:
+            number = known_number(rng.randrange(config.known_numbers))
+        else:
+            number = f"0{UNKNOWN_NUMBER_BASE + rng.randrange(10 ** 6)}"
+        # Numbers come in international format about half of the time
+        if rng.random() < 0.5:
+            number = '972' + number[1:]
+
+        cdr_type = _weighted(rng, config.cdr_type_mix)
+        dial_status = _weighted(rng, config.dial_status_mix)
+        answered = dial_status in ('ANSWER', 'VOICEMAIL')
+        representative_code, representative_name, user_name = rng.choice(REPRESENTATIVES)
+        department_id, department_name = rng.choice(DEPARTMENTS)
+        incoming = cdr_type in (1, 8)
+        recorded = answered and rng.random() < config.recording_ratio
+        call_id = f"fake-{minute:%Y%m%d%H%M}-{index}"
+
+        cdrs.append({
+            'CallID': call_id,
+            'Date': (minute + timedelta(seconds=rng.randrange(60))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            'CallerNumber': number if incoming else '035550000',
+            'TargetNumber': '035550000' if incoming else number,
+            'CallerExtension': None if incoming else representative_code,
+            'TargetExtension': representative_code if incoming else None,
+            'DID': '035550000',
+            'Duration': rng.randrange(20, 900) if answered else 0,
+            'RingTime': rng.randrange(1, 30),
+            'Type': 'Incoming Call' if incoming else 'Extension Outgoing',
+            'CdrType': cdr_type,
+            'DialStatus': dial_status,
+            'RecordURL': f"https://recordings.example.com/{call_id}.mp3" if recorded else '',
+            'RecordExpect': recorded,
+            'Price': round(rng.uniform(0, 0.5), 4),
+            'RepresentativeName': representative_name,
+            'RepresentativeCode': representative_code,
+            'UserName': user_name,
+            'DepartmentName': department_name,
+            'DepartmentId': department_id,
+            'QueueName': rng.choice(QUEUES) if cdr_type == 8 else None,
+            'TargetPrefixName': 'Israel',
+            'DTMFData': [{'digit': str(rng.randrange(10))}] if cdr_type == 8 else None,
+            'CustomData': None,
+        })
+
+        # Voicenter occasionally reports the same call twice in one response
+        if rng.random() < config.duplicate_ratio:
+            cdrs.append(dict(cdrs[-1]))
+    return cdrs
+
+
+def generate_cdrs(from_date, to_date, config):
+    """
+    CDRs dated in [from_date, to_date), oldest first
+
+    Args:
+        from_date: naive UTC datetime
+        to_date: naive UTC datetime
+        config: StreamConfig
+    """
+    minute = from_date.replace(second=0, microsecond=0)
+    cdrs = []
+    while minute < to_date:
+        cdrs.extend(
+            cdr for cdr in _minute_cdrs(minute, config)
+            if from_date <= datetime.strptime(cdr['Date'], "%Y-%m-%dT%H:%M:%SZ") < to_date
+        )
+        minute += timedelta(minutes=1)
+    cdrs.sort(key=lambda cdr: cdr['Date'])
+    return cdrs
+
+
+def make_handler(config, stats):
+    """Request handler class serving the given stream"""
+
+    class FakeVoicenterHandler(BaseHTTPRequestHandler):
+
+        def do_POST(self):
+            if self.path.strip('/') != 'hub/cdr':
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            try:
+                search = body['search']
+                from_date = datetime.strptime(search['fromdate'], "%Y-%m-%dT%H:%M:%S")
+                to_date = datetime.strptime(search['todate'], "%Y-%m-%dT%H:%M:%S")
+            except (KeyError, ValueError) as e:
+                self._send_json({'ERROR_NUMBER': 1, 'ERROR_DESCRIPTION': f"Invalid search: {e}"})
+                return
+
+            cdrs = generate_cdrs(from_date, to_date, config)
+            fields_list = body.get('fields')
+            if fields_list:
+                cdrs = [{key: cdr.get(key) for key in fields_list} for cdr in cdrs]
+            self._send_json({'ERROR_NUMBER': 0, 'CDR_LIST': cdrs}, cdr_count=len(cdrs))
+
+        def _send_json(self, data, cdr_count=0):
+            content = json.dumps(data).encode()
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                content = gzip.compress(content, compresslevel=1)
+                encoding = 'gzip'
+            else:
+                encoding = None
+            stats.record(cdr_count, len(content))
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            _logger.debug(format, *args)
+
+    return FakeVoicenterHandler
+
+
+def start_server(config, host='127.0.0.1', port=0):
+    """
+    Serve the stream from a background thread
+
+    Returns:
+        (server, stats, base_url); call server.shutdown() when done
+    """
+    stats = ServerStats()
+    server = ThreadingHTTPServer((host, port), make_handler(config, stats))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--calls-per-hour', type=int, default=StreamConfig.calls_per_hour)
+    parser.add_argument('--known-numbers', type=int, default=StreamConfig.known_numbers)
+    parser.add_argument('--unknown-ratio', type=float, default=StreamConfig.unknown_ratio)
+    parser.add_argument('--duplicate-ratio', type=float, default=StreamConfig.duplicate_ratio)
+    parser.add_argument('--recording-ratio', type=float, default=StreamConfig.recording_ratio)
+    parser.add_argument('--seed', type=int, default=StreamConfig.seed)
+    args = parser.parse_args()
+
+    config = StreamConfig(
+        calls_per_hour=args.calls_per_hour,
+        known_numbers=args.known_numbers,
+        unknown_ratio=args.unknown_ratio,
+        duplicate_ratio=args.duplicate_ratio,
+        recording_ratio=args.recording_ratio,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config, ServerStats()))
+    print(f"Fake Voicenter API on http://{args.host}:{args.port}/hub/cdr/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
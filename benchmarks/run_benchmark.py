@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""Sync throughput benchmark against the local Voicenter stand-in.
+
+Seeds partners and leads whose numbers the fake CDR stream calls, then
+measures a cold sync (every call new), a warm re-sync of the same range
+(every call unchanged), a full follow-up pass and the partner statistics
+compute. Each stage reports wall time, queries and peak Python memory.
+
+Run inside an Odoo shell on a DISPOSABLE database with the module
+installed; the sync commits as it goes:
+
+    BENCH_HOURS=6 BENCH_CALLS_PER_HOUR=2000 \\
+        odoo-bin shell -d <db> < benchmarks/run_benchmark.py
+
+Settings come from the environment:
+
+    BENCH_HOURS            hours of calls to sync (default 6)
+    BENCH_CALLS_PER_HOUR   call volume of the stream (default 1000)
+    BENCH_PARTNERS         seeded partners (default 1000)
+    BENCH_LEADS            seeded leads (default 200)
+    BENCH_UNKNOWN_RATIO    share of calls from unknown numbers (default 0.2)
+    BENCH_DUPLICATE_RATIO  share of CDRs reported twice (default 0.05)
+    BENCH_MIN_CDRS_PER_SEC fail when the cold sync is slower (default 0, off)
+    BENCH_OUTPUT           write the results to this JSON file
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import odoo.addons.hamarpea_odoo_voicenter as voicenter_module
+
+sys.path.insert(0, os.path.join(os.path.dirname(voicenter_module.__file__), 'benchmarks'))
+import fake_voicenter  # noqa: E402
+
+BENCH_TOKEN = 'voicenter-benchmark-token'
+SEED_REF = 'voicenter-benchmark'
+
+hours = float(os.environ.get('BENCH_HOURS', 6))
+partner_count = int(os.environ.get('BENCH_PARTNERS', 1000))
+lead_count = int(os.environ.get('BENCH_LEADS', 200))
+min_cdrs_per_sec = float(os.environ.get('BENCH_MIN_CDRS_PER_SEC', 0))
+output_path = os.environ.get('BENCH_OUTPUT')
+
+config = fake_voicenter.StreamConfig(
+    calls_per_hour=int(os.environ.get('BENCH_CALLS_PER_HOUR', 1000)),
+    known_numbers=partner_count + lead_count,
+    unknown_ratio=float(os.environ.get('BENCH_UNKNOWN_RATIO', 0.2)),
+    duplicate_ratio=float(os.environ.get('BENCH_DUPLICATE_RATIO', 0.05)),
+)
+
+
+def seed_contacts():
+    """Partners, then leads, on the known numbers of the stream; reused across runs"""
+    Partner = env['res.partner'].with_context(tracking_disable=True)
+    Lead = env['crm.lead'].with_context(tracking_disable=True)
+    partners = Partner.search([('ref', '=', SEED_REF)])
+    if len(partners) < partner_count:
+        partners |= Partner.create([{
+            'name': f"Benchmark Partner {index}",
+            'ref': SEED_REF,
+            'phone': fake_voicenter.known_number(index),
+        } for index in range(len(partners), partner_count)])
+    leads = Lead.search([('referred', '=', SEED_REF)])
+    if len(leads) < lead_count:
+        leads |= Lead.create([{
+            'name': f"Benchmark Lead {index}",
+            'referred': SEED_REF,
+            'phone': fake_voicenter.known_number(partner_count + index),
+        } for index in range(len(leads), lead_count)])
+    env.cr.commit()
+    return partners, leads
+
+
+def measure(label, stage):
+    """Run a stage and return its wall time, query count and peak memory"""
+    env.flush_all()
+    env.invalidate_all()
+    queries_before = env.cr.sql_log_count
+    tracemalloc.start()
+    started = time.perf_counter()
+    stage()
+    env.flush_all()
+    seconds = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        'seconds': seconds,
+        'queries': env.cr.sql_log_count - queries_before,
+        'peak_memory_mb': peak / 1024 / 1024,
+    }
+    print(f"{label:<28} {seconds:9.2f} s {result['queries']:9d} queries "
+          f"{result['peak_memory_mb']:9.1f} MB peak")
+    return result
+
+
+def sync_stage(server_stats, results, key):
+    """Sync the whole benchmark range, ignoring the watermark of earlier runs"""
+    CallLog = env['voicenter.call.log']
+    sync_state = env['voicenter.sync.state'].sudo()._get_for_token(BENCH_TOKEN)
+    sync_state.watermark = False
+    cdrs_before = server_stats.cdrs
+    result = measure(key, lambda: CallLog.sync_from_voicenter(hours_back=hours))
+    cdr_count = server_stats.cdrs - cdrs_before
+    result.update({
+        'cdrs': cdr_count,
+        'cdrs_per_sec': cdr_count / result['seconds'] if result['seconds'] else 0.0,
+        'queries_per_cdr': result['queries'] / cdr_count if cdr_count else 0.0,
+    })
+    print(f"{'':<28} {cdr_count} CDRs, {result['cdrs_per_sec']:.0f} CDRs/s, "
+          f"{result['queries_per_cdr']:.2f} queries/CDR")
+    results[key] = result
+
+
+ICPSudo = env['ir.config_parameter'].sudo()
+saved_params = {key: ICPSudo.get_param(key) for key in ('voicenter.api_token', 'voicenter.api_base_url')}
+server, server_stats, base_url = fake_voicenter.start_server(config)
+results = {'config': {
+    'hours': hours,
+    'calls_per_hour': config.calls_per_hour,
+    'partners': partner_count,
+    'leads': lead_count,
+    'unknown_ratio': config.unknown_ratio,
+    'duplicate_ratio': config.duplicate_ratio,
+}}
+try:
+    ICPSudo.set_param('voicenter.api_token', BENCH_TOKEN)
+    ICPSudo.set_param('voicenter.api_base_url', base_url)
+    partners, leads = seed_contacts()
+    print(f"Fake Voicenter API on {base_url}, {len(partners)} partners, {len(leads)} leads")
+
+    sync_stage(server_stats, results, 'cold_sync')
+    sync_stage(server_stats, results, 'warm_resync')
+    results['identify_unclosed_calls'] = measure(
+        'identify_unclosed_calls', lambda: env['voicenter.call.log']._identify_unclosed_calls())
+    results['partner_call_stats'] = measure(
+        'partner_call_stats', lambda: partners._compute_voicenter_call_stats())
+    env.cr.commit()
+finally:
+    server.shutdown()
+    for key, value in saved_params.items():
+        ICPSudo.set_param(key, value or False)
+    env.cr.commit()
+
+if output_path:
+    with open(output_path, 'w') as output:
+        json.dump(results, output, indent=2)
+
+if min_cdrs_per_sec and results['cold_sync']['cdrs_per_sec'] < min_cdrs_per_sec:
+    print(f"FAIL: cold sync ran at {results['cold_sync']['cdrs_per_sec']:.0f} CDRs/s, "
+          f"below the {min_cdrs_per_sec:.0f} CDRs/s threshold")
+    sys.exit(1)
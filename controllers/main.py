@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import hmac
+import json
+import logging
+import mimetypes
+import os
+
+from werkzeug.exceptions import NotFound
+
+from odoo import http
+from odoo.exceptions import AccessError
+from odoo.http import Stream, request
+
+_logger = logging.getLogger(__name__)
+
+
+class VoicenterWebhookController(http.Controller):
+
+    @http.route('/voicenter/webhook/cdr', type='http', auth='public', methods=['POST'],
+                csrf=False, save_session=False)
+    def receive_cdr(self, **kwargs):
+        """
+        Receive CDR push notifications from Voicenter
+
+        The body is a single CDR, a list of CDRs or an object with a
+        CDR_LIST, using the same field names as the CDR API. CDRs are only
+        queued here; the queue cron ingests them in micro-batches.
+
+        The shared secret is only accepted in the X-Voicenter-Token header,
+        never in the URL, where access logs would record it.
+        """
+        ICPSudo = request.env['ir.config_parameter'].sudo()
+        secret = ICPSudo.get_param('voicenter.webhook_secret')
+        token = request.httprequest.headers.get('X-Voicenter-Token') or ''
+        # Compared as bytes: compare_digest() rejects non-ASCII str arguments
+        if not secret or not hmac.compare_digest(secret.encode(), token.encode()):
+            _logger.warning("Rejected Voicenter webhook call with an invalid token")
+            return request.make_json_response({'error': 'Forbidden'}, status=403)
+
+        try:
+            data = json.loads(request.httprequest.get_data())
+        except ValueError:
+            return request.make_json_response({'error': 'Invalid JSON'}, status=400)
+
+        if isinstance(data, dict):
+            cdr_list = data['CDR_LIST'] if isinstance(data.get('CDR_LIST'), list) else [data]
+        elif isinstance(data, list):
+            cdr_list = data
+        else:
+            cdr_list = []
+
+        valid_cdrs = [cdr for cdr in cdr_list if isinstance(cdr, dict) and cdr.get('CallID')]
+        if not valid_cdrs:
+            return request.make_json_response({'error': 'No CDR with a CallID'}, status=400)
+
+        request.env['voicenter.cdr.queue'].sudo()._enqueue(valid_cdrs)
+        return request.make_json_response({
+            'status': 'ok',
+            'queued': len(valid_cdrs),
+            'ignored': len(cdr_list) - len(valid_cdrs),
+        })
+
+
+class VoicenterRecordingController(http.Controller):
+
+    @http.route('/voicenter/recording/<int:call_log_id>', type='http', auth='user', methods=['GET'])
+    def stream_recording(self, call_log_id, **kwargs):
+        """
+        Serve the recording of a call from the local recording cache
+
+        The file is streamed from disk with conditional and Range request
+        support, so players can seek without downloading it all. Calls
+        whose recording cannot be cached are redirected to Voicenter.
+        """
+        call = request.env['voicenter.call.log'].browse(call_log_id).exists()
+        if not call:
+            raise NotFound()
+        try:
+            call.check_access('read')
+        except AccessError:
+            raise NotFound()
+        if not call.record_url:
+            raise NotFound()
+
+        path = request.env['voicenter.recording.cache'].sudo()._get_recording_path(call)
+        if not path:
+            return request.redirect(call.record_url, local=False)
+
+        stat = os.stat(path)
+        url_path = call.record_url.split('?', 1)[0]
+        stream = Stream(
+            type='path',
+            path=path,
+            mimetype=mimetypes.guess_type(url_path)[0] or 'audio/mpeg',
+            download_name=f"{call.call_id}{os.path.splitext(url_path)[1] or '.mp3'}",
+            conditional=True,
+            etag=f"{call.call_id}-{stat.st_size}",
+            size=stat.st_size,
+            max_age=3600,
+        )
+        return stream.get_response()
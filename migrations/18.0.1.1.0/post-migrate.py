@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Move the call dimension strings to lookup tables referenced by id."""
+import logging
+
+from odoo import api, SUPERUSER_ID
+from odoo.tools import SQL
+from odoo.tools.sql import column_exists
+
+_logger = logging.getLogger(__name__)
+
+# (new column, dimension model, old key column, {dimension field: old column})
+DIMENSIONS = [
+    ('representative_id', 'voicenter.representative', 'representative_code',
+     {'name': 'representative_name', 'user_name': 'user_name'}),
+    ('department_id', 'voicenter.department', 'department_name', {'external_id': 'department_id_ext'}),
+    ('queue_id', 'voicenter.queue', 'queue_name', {}),
+    ('destination_id', 'voicenter.destination', 'target_prefix_name', {}),
+]
+OLD_COLUMNS = [
+    'representative_name', 'representative_code', 'user_name', 'department_name',
+    'department_id_ext', 'queue_name', 'target_prefix_name',
+]
+TABLES = ['voicenter_call_log', 'voicenter_call_log_archive']
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+
+    for table in TABLES:
+        if not column_exists(cr, table, 'representative_code'):
+            continue
+
+        # Register every distinct value, with the attributes of its latest call
+        assignments = []
+        for column, model_name, key_column, value_columns in DIMENSIONS:
+            Dimension = env[model_name]
+            cr.execute(SQL("""
+                SELECT DISTINCT ON (%(key)s) %(columns)s
+                  FROM %(table)s
+                 WHERE %(key)s IS NOT NULL AND %(key)s != ''
+              ORDER BY %(key)s, date DESC
+            """, key=SQL.identifier(key_column), table=SQL.identifier(table),
+                columns=SQL(', ').join(SQL.identifier(name) for name in [key_column, *value_columns.values()])))
+            values_by_key = {
+                row[0]: dict(zip(value_columns, row[1:])) for row in cr.fetchall()
+            }
+            if values_by_key:
+                Dimension._resolve_dimension_ids(values_by_key)
+            assignments.append(SQL(
+                "%(column)s = (SELECT id FROM %(dimension)s WHERE %(dimension_key)s = %(table)s.%(key)s)",
+                column=SQL.identifier(column), dimension=SQL.identifier(Dimension._table),
+                dimension_key=SQL.identifier(Dimension._dimension_key),
+                table=SQL.identifier(table), key=SQL.identifier(key_column)))
+        env.flush_all()
+
+        # One pass over the table sets all references
+        cr.execute(SQL("UPDATE %s SET %s", SQL.identifier(table), SQL(', ').join(assignments)))
+        _logger.info(f"Linked {cr.rowcount} rows of {table} to their dimensions")
+
+        cr.execute(SQL("ALTER TABLE %s %s", SQL.identifier(table), SQL(', ').join(
+            SQL("DROP COLUMN IF EXISTS %s", SQL.identifier(name)) for name in OLD_COLUMNS)))
+
+    # The rollup was grouped on the old strings, rebuild it
+    cr.execute(SQL("DELETE FROM voicenter_call_stats"))
+    cr.execute(SQL("""
+        INSERT INTO voicenter_call_stats_pending (hour_start)
+        SELECT DISTINCT date_trunc('hour', date) FROM voicenter_call_log
+         UNION
+        SELECT DISTINCT date_trunc('hour', date) FROM voicenter_call_log_archive
+        ON CONFLICT (hour_start) DO NOTHING
+    """))
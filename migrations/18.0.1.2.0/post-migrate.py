@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""Drop the call log copies of contact and lead names, now read through a join."""
+from odoo.tools import SQL
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    cr.execute(SQL("""
+        ALTER TABLE voicenter_call_log
+            DROP COLUMN IF EXISTS partner_name,
+            DROP COLUMN IF EXISTS lead_name
+    """))
@@ -3,3 +3,15 @@ from . import voicenter_call_log
 from . import res_config_settings
 from . import res_partner
 from . import crm_lead
+from . import voicenter_sync_state
+from . import voicenter_sync_run
+from . import voicenter_dimension
+from . import voicenter_representative
+from . import voicenter_cdr_queue
+from . import voicenter_backfill
+from . import voicenter_cdr_dead_letter
+from . import voicenter_call_log_archive
+from . import voicenter_call_history
+from . import voicenter_call_stats
+from . import voicenter_recording_cache
+from . import voicenter_recording_pending
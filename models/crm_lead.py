@@ -1,38 +1,76 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
 
+from ..tools.phone import normalize_phone
+
 
 class CrmLead(models.Model):
     _inherit = 'crm.lead'
 
+    voicenter_call_ids = fields.One2many(
+        'voicenter.call.log', 'lead_id',
+        string='Voicenter Calls'
+    )
+
     voicenter_call_count = fields.Integer(
         'Call Count',
-        compute='_compute_voicenter_call_count'
+        compute='_compute_voicenter_call_stats',
+        store=True
     )
     
     voicenter_last_call_date = fields.Datetime(
         'Last Call',
-        compute='_compute_voicenter_last_call'
+        compute='_compute_voicenter_call_stats',
+        store=True
+    )
+
+    # Normalized phone keys used to match Voicenter calls
+    voicenter_phone_key = fields.Char(
+        'Phone Key',
+        compute='_compute_voicenter_phone_keys',
+        store=True,
+        index='btree_not_null'
+    )
+
+    voicenter_mobile_key = fields.Char(
+        'Mobile Key',
+        compute='_compute_voicenter_phone_keys',
+        store=True,
+        index='btree_not_null'
     )
 
-    def _compute_voicenter_call_count(self):
-        """Count calls linked to this lead"""
+    @api.depends('phone', 'mobile')
+    def _compute_voicenter_phone_keys(self):
+        """Normalize phone and mobile for call matching"""
         for lead in self:
-            lead.voicenter_call_count = self.env['voicenter.call.log'].search_count([
-                ('lead_id', '=', lead.id)
-            ])
+            lead.voicenter_phone_key = normalize_phone(lead.phone)
+            lead.voicenter_mobile_key = normalize_phone(lead.mobile)
+
+    @api.depends('voicenter_call_ids.date')
+    def _compute_voicenter_call_stats(self):
+        """Compute call statistics of all leads with a single grouped query"""
+        # Archived calls still count towards the statistics
+        stats = {}
+        for model_name in ('voicenter.call.log', 'voicenter.call.log.archive'):
+            groups = self.env[model_name].sudo()._read_group(
+                [('lead_id', 'in', self.ids)],
+                ['lead_id'],
+                ['__count', 'date:max'],
+            )
+            for lead, count, last_date in groups:
+                total_count, total_last_date = stats.get(lead.id, (0, False))
+                if not total_last_date or (last_date and last_date > total_last_date):
+                    total_last_date = last_date
+                stats[lead.id] = (total_count + count, total_last_date)
 
-    def _compute_voicenter_last_call(self):
-        """Get last call date"""
         for lead in self:
-            last_call = self.env['voicenter.call.log'].search([
-                ('lead_id', '=', lead.id)
-            ], order='date desc', limit=1)
-            lead.voicenter_last_call_date = last_call.date if last_call else False
+            lead.voicenter_call_count, lead.voicenter_last_call_date = stats.get(lead.id, (0, False))
 
     def action_view_calls(self):
         """Open call log list view for this lead"""
         self.ensure_one()
+        if self.env['voicenter.call.log.archive'].search_count([('lead_id', '=', self.id)], limit=1):
+            return self._action_view_call_history()
         return {
             'name': f'Calls - {self.name}',
             'type': 'ir.actions.act_window',
@@ -41,3 +79,14 @@ class CrmLead(models.Model):
             'domain': [('lead_id', '=', self.id)],
             'context': {'default_lead_id': self.id},
         }
+
+    def _action_view_call_history(self):
+        """Open live and archived calls of this lead together"""
+        self.ensure_one()
+        return {
+            'name': f'Calls - {self.name}',
+            'type': 'ir.actions.act_window',
+            'res_model': 'voicenter.call.history',
+            'view_mode': 'list',
+            'domain': [('lead_id', '=', self.id)],
+        }
@@ -2,6 +2,25 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
+from .voicenter_call_log import FOLLOWUP_WINDOW_DAYS
+
+# Integer settings where 0 turns a feature off: (field, parameter, default).
+# res.config.settings deletes config_parameter fields saved as 0, which brings
+# back the default, so these are stored as text by get_values()/set_values().
+ZERO_DISABLES_PARAMS = [
+    ('voicenter_recording_cache_mb', 'voicenter.recording_cache_mb', 2048),
+    ('voicenter_recording_prefetch_days', 'voicenter.recording_prefetch_days', 7),
+]
+
+# Boolean settings that are on by default: (field, parameter). Saving False
+# would delete a config_parameter field and turn them back on, so these are
+# stored as 'True'/'False' by get_values()/set_values().
+TRUE_BY_DEFAULT_PARAMS = [
+    ('voicenter_sync_enabled', 'voicenter.sync_enabled'),
+    ('voicenter_auto_create_leads', 'voicenter.auto_create_leads'),
+    ('voicenter_create_activities', 'voicenter.create_activities'),
+]
+
 
 class ResConfigSettings(models.TransientModel):
     _inherit = 'res.config.settings'
@@ -12,9 +31,14 @@ class ResConfigSettings(models.TransientModel):
         help='Your Voicenter API authentication token'
     )
 
+    voicenter_webhook_secret = fields.Char(
+        string='Webhook Secret',
+        config_parameter='voicenter.webhook_secret',
+        help='Shared secret Voicenter sends in the X-Voicenter-Token header when pushing CDRs'
+    )
+
     voicenter_sync_enabled = fields.Boolean(
         string='Enable Automatic Sync',
-        config_parameter='voicenter.sync_enabled',
         default=True,
         help='Enable or disable automatic call log synchronization'
     )
@@ -54,20 +78,102 @@ class ResConfigSettings(models.TransientModel):
         help='Sync interval outside business hours (in minutes)'
     )
     
+    voicenter_sync_batch_size = fields.Integer(
+        string='Sync Batch Size',
+        config_parameter='voicenter.sync_batch_size',
+        default=500,
+        help='Number of call records created or updated per batch during sync'
+    )
+    
+    voicenter_fetch_window_minutes = fields.Integer(
+        string='Fetch Window (minutes)',
+        config_parameter='voicenter.fetch_window_minutes',
+        default=60,
+        help='Sync ranges are fetched from Voicenter and committed one window of this length at a time'
+    )
+    
+    voicenter_backfill_workers = fields.Integer(
+        string='Backfill Workers',
+        config_parameter='voicenter.backfill_workers',
+        default=4,
+        help='Number of backfill shards fetched and ingested concurrently'
+    )
+    
+    voicenter_hot_retention_days = fields.Integer(
+        string='Keep Calls Live (days)',
+        config_parameter='voicenter.hot_retention_days',
+        default=0,
+        help='Calls older than this are moved to the call archive every night. 0 keeps all calls live; '
+             'otherwise at least 7 days, so missed calls are still checked for follow-up.'
+    )
+    
+    voicenter_max_catchup_hours = fields.Integer(
+        string='Max Catch-up (hours)',
+        config_parameter='voicenter.max_catchup_hours',
+        default=72,
+        help='After an outage, scheduled sync catches up at most this many hours of missed calls'
+    )
+    
+    voicenter_catchup_chunk_hours = fields.Integer(
+        string='Max Catch-up Chunk (hours)',
+        config_parameter='voicenter.catchup_chunk_hours',
+        default=6,
+        help='Upper bound of the chunks a catch-up is split into; '
+             'chunks are sized from the call volume of recent syncs'
+    )
+    
+    voicenter_recording_cache_mb = fields.Integer(
+        string='Recording Cache Size (MB)',
+        default=2048,
+        help='Disk space for locally cached call recordings; least recently played ones are evicted first. '
+             '0 disables the cache and plays recordings from Voicenter.'
+    )
+    
+    voicenter_recording_prefetch_days = fields.Integer(
+        string='Prefetch Recordings (days)',
+        default=7,
+        help='Recordings of calls from the last this many days are downloaded in the background. 0 disables prefetching.'
+    )
+    
+    voicenter_recording_ttl_hours = fields.Integer(
+        string='Wait for Recordings (hours)',
+        config_parameter='voicenter.recording_ttl_hours',
+        default=48,
+        help='Calls announced with a recording but no URL are re-fetched until the URL arrives or this many hours pass'
+    )
+    
+    voicenter_sync_profile = fields.Boolean(
+        string='Profile Syncs',
+        config_parameter='voicenter.sync_profile',
+        default=False,
+        help='Run every sync under cProfile and store the report on its sync run'
+    )
+    
     voicenter_auto_create_leads = fields.Boolean(
         string='Auto-Create Leads',
-        config_parameter='voicenter.auto_create_leads',
         default=True,
         help='Automatically create leads for unknown incoming callers'
     )
     
     voicenter_create_activities = fields.Boolean(
         string='Create Follow-up Activities',
-        config_parameter='voicenter.create_activities',
         default=True,
         help='Automatically create activities for missed calls needing follow-up'
     )
 
+    @api.model
+    def get_values(self):
+        res = super(ResConfigSettings, self).get_values()
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        for field_name, key, default in ZERO_DISABLES_PARAMS:
+            try:
+                res[field_name] = int(ICPSudo.get_param(key, default))
+            except (TypeError, ValueError):
+                res[field_name] = default
+        for field_name, key in TRUE_BY_DEFAULT_PARAMS:
+            res[field_name] = ICPSudo.get_param(key, 'True').lower() not in ('false', '0', 'no')
+        return res
+
     def set_values(self):
         """Override to add validation before saving config parameters"""
         # Validate business hours
@@ -84,8 +190,39 @@ class ResConfigSettings(models.TransientModel):
         if self.voicenter_off_peak_sync_interval < 1 or self.voicenter_off_peak_sync_interval > 60:
             raise ValidationError(_('Off-peak sync interval must be between 1 and 60 minutes'))
 
+        # Validate batch size
+        if self.voicenter_sync_batch_size < 1 or self.voicenter_sync_batch_size > 10000:
+            raise ValidationError(_('Sync batch size must be between 1 and 10000'))
+        if self.voicenter_fetch_window_minutes < 1 or self.voicenter_fetch_window_minutes > 1440:
+            raise ValidationError(_('Fetch window must be between 1 and 1440 minutes'))
+
+        if self.voicenter_backfill_workers < 1 or self.voicenter_backfill_workers > 16:
+            raise ValidationError(_('Backfill workers must be between 1 and 16'))
+
+        if self.voicenter_max_catchup_hours < 1 or self.voicenter_max_catchup_hours > 720:
+            raise ValidationError(_('Max catch-up must be between 1 and 720 hours'))
+        if self.voicenter_catchup_chunk_hours < 1 or self.voicenter_catchup_chunk_hours > 48:
+            raise ValidationError(_('Catch-up chunk must be between 1 and 48 hours'))
+
+        if self.voicenter_recording_cache_mb < 0:
+            raise ValidationError(_('Recording cache size cannot be negative'))
+        if self.voicenter_recording_prefetch_days < 0:
+            raise ValidationError(_('Recording prefetch days cannot be negative'))
+        if self.voicenter_recording_ttl_hours < 1:
+            raise ValidationError(_('Recordings must be waited for at least 1 hour'))
+
+        if self.voicenter_hot_retention_days < 0 or 0 < self.voicenter_hot_retention_days < FOLLOWUP_WINDOW_DAYS:
+            raise ValidationError(_('Live call retention must be 0 (keep all calls live) or at least %s days',
+                                    FOLLOWUP_WINDOW_DAYS))
+
         super(ResConfigSettings, self).set_values()
 
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        for field_name, key, _default in ZERO_DISABLES_PARAMS:
+            ICPSudo.set_param(key, str(self[field_name]))
+        for field_name, key in TRUE_BY_DEFAULT_PARAMS:
+            ICPSudo.set_param(key, str(self[field_name]))
+
     def action_sync_now(self):
         """Manual sync button"""
         self.env['voicenter.call.log'].sync_from_voicenter(hours_back=24)
@@ -99,3 +236,26 @@ class ResConfigSettings(models.TransientModel):
                 'sticky': False,
             }
         }
+
+    def action_check_voicenter_indexes(self):
+        """
+        Verify the call log indexes
+
+        Building an index locks the call log against writes, so this only
+        reports; the indexes are rebuilt when the module is updated.
+        """
+        missing = self.env['voicenter.call.log'].sudo()._check_call_log_indexes()
+        if missing:
+            message = _('Missing or invalid indexes: %s. Update the module to rebuild them.', ', '.join(missing))
+        else:
+            message = _('All call log indexes are in place')
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Voicenter Indexes'),
+                'message': message,
+                'type': 'warning' if missing else 'success',
+                'sticky': False,
+            }
+        }
@@ -1,59 +1,99 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
 
+from ..tools.phone import normalize_phone
+
 
 class ResPartner(models.Model):
     _inherit = 'res.partner'
 
+    voicenter_call_ids = fields.One2many(
+        'voicenter.call.log', 'partner_id',
+        string='Voicenter Calls'
+    )
+
     voicenter_call_count = fields.Integer(
         'Call Count',
-        compute='_compute_voicenter_call_count'
+        compute='_compute_voicenter_call_stats',
+        store=True
     )
     
     voicenter_last_call_date = fields.Datetime(
         'Last Call',
-        compute='_compute_voicenter_last_call'
+        compute='_compute_voicenter_call_stats',
+        store=True
     )
     
     voicenter_total_call_duration = fields.Integer(
         'Total Call Duration (min)',
-        compute='_compute_voicenter_call_stats'
+        compute='_compute_voicenter_call_stats',
+        store=True
     )
     
     voicenter_missed_call_count = fields.Integer(
         'Missed Calls',
-        compute='_compute_voicenter_call_stats'
+        compute='_compute_voicenter_call_stats',
+        store=True
     )
 
-    def _compute_voicenter_call_count(self):
-        """Count calls linked to this partner"""
-        for partner in self:
-            partner.voicenter_call_count = self.env['voicenter.call.log'].search_count([
-                ('partner_id', '=', partner.id)
-            ])
+    # Normalized phone keys used to match Voicenter calls
+    voicenter_phone_key = fields.Char(
+        'Phone Key',
+        compute='_compute_voicenter_phone_keys',
+        store=True,
+        index='btree_not_null'
+    )
+
+    voicenter_mobile_key = fields.Char(
+        'Mobile Key',
+        compute='_compute_voicenter_phone_keys',
+        store=True,
+        index='btree_not_null'
+    )
 
-    def _compute_voicenter_last_call(self):
-        """Get last call date"""
+    @api.depends('phone', 'mobile')
+    def _compute_voicenter_phone_keys(self):
+        """Normalize phone and mobile for call matching"""
         for partner in self:
-            last_call = self.env['voicenter.call.log'].search([
-                ('partner_id', '=', partner.id)
-            ], order='date desc', limit=1)
-            partner.voicenter_last_call_date = last_call.date if last_call else False
+            partner.voicenter_phone_key = normalize_phone(partner.phone)
+            partner.voicenter_mobile_key = normalize_phone(partner.mobile)
 
+    @api.depends('voicenter_call_ids.date', 'voicenter_call_ids.duration',
+                 'voicenter_call_ids.is_missed')
     def _compute_voicenter_call_stats(self):
-        """Compute call statistics"""
+        """Compute call statistics of all partners with a single grouped query"""
+        empty_stats = {'count': 0, 'last_date': False, 'duration': 0, 'missed': 0}
+        stats = {}
+
+        # Archived calls still count towards the statistics
+        groups = []
+        for model_name in ('voicenter.call.log', 'voicenter.call.log.archive'):
+            groups += self.env[model_name].sudo()._read_group(
+                [('partner_id', 'in', self.ids)],
+                ['partner_id', 'is_missed'],
+                ['__count', 'date:max', 'duration:sum'],
+            )
+        for partner, is_missed, count, last_date, duration in groups:
+            partner_stats = stats.setdefault(partner.id, dict(empty_stats))
+            partner_stats['count'] += count
+            partner_stats['duration'] += duration or 0
+            if is_missed:
+                partner_stats['missed'] += count
+            if last_date and (not partner_stats['last_date'] or last_date > partner_stats['last_date']):
+                partner_stats['last_date'] = last_date
+
         for partner in self:
-            calls = self.env['voicenter.call.log'].search([
-                ('partner_id', '=', partner.id)
-            ])
-            
-            total_duration = sum(calls.mapped('duration'))
-            partner.voicenter_total_call_duration = total_duration // 60  # Convert to minutes
-            partner.voicenter_missed_call_count = len(calls.filtered('is_missed'))
+            partner_stats = stats.get(partner.id, empty_stats)
+            partner.voicenter_call_count = partner_stats['count']
+            partner.voicenter_last_call_date = partner_stats['last_date']
+            partner.voicenter_total_call_duration = partner_stats['duration'] // 60  # Convert to minutes
+            partner.voicenter_missed_call_count = partner_stats['missed']
 
     def action_view_calls(self):
         """Open call log list view for this partner"""
         self.ensure_one()
+        if self.env['voicenter.call.log.archive'].search_count([('partner_id', '=', self.id)], limit=1):
+            return self._action_view_call_history()
         return {
             'name': f'Calls - {self.name}',
             'type': 'ir.actions.act_window',
@@ -62,3 +102,14 @@ class ResPartner(models.Model):
             'domain': [('partner_id', '=', self.id)],
             'context': {'default_partner_id': self.id},
         }
+
+    def _action_view_call_history(self):
+        """Open live and archived calls of this partner together"""
+        self.ensure_one()
+        return {
+            'name': f'Calls - {self.name}',
+            'type': 'ir.actions.act_window',
+            'res_model': 'voicenter.call.history',
+            'view_mode': 'list',
+            'domain': [('partner_id', '=', self.id)],
+        }
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import logging
+import time
+
+from .voicenter_call_log import CDR_FIELDS
+
+_logger = logging.getLogger(__name__)
+
+# First key of the PostgreSQL advisory locks held by running shards; the second is the shard id
+SHARD_LOCK_NAMESPACE = 0x56434e42
+# Running shards are only checked for a crashed worker after this long, giving
+# the worker time to take the shard's lock once it is claimed
+STALE_SHARD_MINUTES = 5
+# A cron run stops claiming new shards after this many seconds and re-triggers itself
+CRON_TIME_BUDGET = 600
+
+
+class VoicenterBackfill(models.Model):
+    _name = 'voicenter.backfill'
+    _description = 'Voicenter Historical Backfill'
+    _order = 'id desc'
+
+    name = fields.Char('Name', compute='_compute_name', store=True)
+    date_from = fields.Datetime('From', required=True)
+    date_to = fields.Datetime('To', required=True, default=fields.Datetime.now)
+    shard_hours = fields.Integer('Shard Size (hours)', required=True, default=24,
+                                 help='The range is split into shards of this length, fetched concurrently')
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='State', default='draft', required=True)
+    started_at = fields.Datetime('Started At', readonly=True)
+    finished_at = fields.Datetime('Finished At', readonly=True)
+
+    shard_ids = fields.One2many('voicenter.backfill.shard', 'backfill_id', string='Shards')
+    shard_count = fields.Integer('Shards', compute='_compute_progress')
+    shard_done_count = fields.Integer('Shards Done', compute='_compute_progress')
+    shard_failed_count = fields.Integer('Shards Failed', compute='_compute_progress')
+    progress = fields.Float('Progress (%)', compute='_compute_progress')
+    cdr_count = fields.Integer('CDRs Fetched', compute='_compute_progress')
+    throughput = fields.Float('Throughput (CDRs/s)', compute='_compute_progress', digits=(16, 1))
+
+    @api.depends('date_from', 'date_to')
+    def _compute_name(self):
+        for backfill in self:
+            if backfill.date_from and backfill.date_to:
+                backfill.name = f"{backfill.date_from:%Y-%m-%d %H:%M} - {backfill.date_to:%Y-%m-%d %H:%M}"
+            else:
+                backfill.name = _('New Backfill')
+
+    @api.depends('shard_ids.state', 'shard_ids.cdr_count')
+    def _compute_progress(self):
+        groups = self.env['voicenter.backfill.shard']._read_group(
+            [('backfill_id', 'in', self.ids)],
+            ['backfill_id', 'state'],
+            ['__count', 'cdr_count:sum'],
+        )
+        counts = {}
+        for backfill, state, count, cdr_count in groups:
+            backfill_counts = counts.setdefault(backfill.id, {'total': 0, 'cdrs': 0})
+            backfill_counts['total'] += count
+            backfill_counts['cdrs'] += cdr_count or 0
+            backfill_counts[state] = count
+
+        now = fields.Datetime.now()
+        for backfill in self:
+            backfill_counts = counts.get(backfill.id, {})
+            total = backfill_counts.get('total', 0)
+            backfill.shard_count = total
+            backfill.shard_done_count = backfill_counts.get('done', 0)
+            backfill.shard_failed_count = backfill_counts.get('failed', 0)
+            backfill.progress = 100.0 * backfill.shard_done_count / total if total else 0.0
+            backfill.cdr_count = backfill_counts.get('cdrs', 0)
+
+            elapsed = backfill.started_at and ((backfill.finished_at or now) - backfill.started_at).total_seconds()
+            backfill.throughput = backfill.cdr_count / elapsed if elapsed else 0.0
+
+    @api.constrains('date_from', 'date_to', 'shard_hours')
+    def _check_range(self):
+        for backfill in self:
+            if backfill.date_from >= backfill.date_to:
+                raise ValidationError(_('The backfill start must be before its end'))
+            if backfill.shard_hours < 1:
+                raise ValidationError(_('Shard size must be at least one hour'))
+
+    def action_start(self):
+        """Split the range into shards and hand them to the backfill cron"""
+        for backfill in self.filtered(lambda b: b.state == 'draft'):
+            shard_size = timedelta(hours=backfill.shard_hours)
+            shard_vals_list = []
+            shard_start = backfill.date_from
+            while shard_start < backfill.date_to:
+                shard_end = min(shard_start + shard_size, backfill.date_to)
+                shard_vals_list.append({
+                    'backfill_id': backfill.id,
+                    'date_from': shard_start,
+                    'date_to': shard_end,
+                })
+                shard_start = shard_end
+
+            self.env['voicenter.backfill.shard'].create(shard_vals_list)
+            backfill.write({'state': 'running', 'started_at': fields.Datetime.now()})
+
+        self.env.ref('hamarpea_odoo_voicenter.ir_cron_voicenter_backfill')._trigger()
+
+    def action_retry_failed(self):
+        """Resume a backfill by putting its failed shards back in the queue"""
+        self.shard_ids.filtered(lambda s: s.state == 'failed').write({'state': 'pending', 'error': False})
+        self.filtered(lambda b: b.state == 'failed').write({'state': 'running', 'finished_at': False})
+        self.env.ref('hamarpea_odoo_voicenter.ir_cron_voicenter_backfill')._trigger()
+
+    @api.model
+    def _get_worker_count(self):
+        """Number of shards fetched and ingested concurrently"""
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        try:
+            workers = int(ICPSudo.get_param('voicenter.backfill_workers', 4))
+        except (TypeError, ValueError):
+            workers = 4
+        return min(max(workers, 1), 16)
+
+    @api.model
+    def _cron_run_backfills(self):
+        """
+        Process pending backfill shards
+
+        Shards are claimed in waves of one per worker. Each worker thread
+        fetches its shard through its own API client and ingests it with its
+        own cursor, committing per shard, so a crash only loses the shards
+        in flight; those are picked up again once they go stale. A worker
+        that fails outside the shard's own error handling marks it failed.
+        """
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        api_token = ICPSudo.get_param('voicenter.api_token')
+        if not api_token:
+            _logger.warning("Voicenter backfill skipped: API token not configured")
+            return
+
+        Shard = self.env['voicenter.backfill.shard']
+        Shard._recover_stale_shards()
+
+        CallLog = self.env['voicenter.call.log']
+        sync_state = self.env['voicenter.sync.state'].sudo()._get_for_token(api_token)
+        CallLog._commit_sync_progress()
+        workers = self._get_worker_count()
+        deadline = time.monotonic() + CRON_TIME_BUDGET
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='voicenter_backfill') as executor:
+            while time.monotonic() < deadline:
+                shard_ids = Shard._claim_pending(workers)
+                if not shard_ids:
+                    break
+                futures = {
+                    executor.submit(Shard._run_in_new_cursor, shard_id, api_token, sync_state.id): shard_id
+                    for shard_id in shard_ids
+                }
+                for future, shard_id in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # Failures outside the shard's own error handling, e.g. opening its cursor
+                        _logger.exception(f"Voicenter backfill worker of shard {shard_id} failed")
+                        Shard.browse(shard_id).write({
+                            'state': 'failed',
+                            'error': str(e),
+                            'finished_at': fields.Datetime.now(),
+                        })
+                        CallLog._commit_sync_progress()
+            else:
+                # Out of time budget, continue in a fresh cron run
+                self.env.ref('hamarpea_odoo_voicenter.ir_cron_voicenter_backfill')._trigger()
+
+        self.env.invalidate_all()
+        self.search([('state', '=', 'running')])._update_state()
+
+    def _update_state(self):
+        """Close backfills that have no shard left to run"""
+        for backfill in self:
+            states = set(backfill.shard_ids.mapped('state'))
+            if states & {'pending', 'running'}:
+                continue
+            backfill.write({
+                'state': 'failed' if 'failed' in states else 'done',
+                'finished_at': fields.Datetime.now(),
+            })
+            _logger.info(
+                f"Voicenter backfill {backfill.name} finished: {backfill.cdr_count} CDRs, "
+                f"{backfill.throughput:.1f} CDRs/s, {backfill.shard_failed_count} failed shards")
+
+
+class VoicenterBackfillShard(models.Model):
+    _name = 'voicenter.backfill.shard'
+    _description = 'Voicenter Backfill Shard'
+    _order = 'date_from'
+
+    backfill_id = fields.Many2one('voicenter.backfill', string='Backfill', required=True,
+                                  ondelete='cascade', index=True)
+    date_from = fields.Datetime('From', required=True)
+    date_to = fields.Datetime('To', required=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='State', default='pending', required=True, index=True)
+    attempts = fields.Integer('Attempts', readonly=True)
+    started_at = fields.Datetime('Started At', readonly=True)
+    finished_at = fields.Datetime('Finished At', readonly=True)
+    cdr_count = fields.Integer('CDRs', readonly=True)
+    created_count = fields.Integer('Created', readonly=True)
+    updated_count = fields.Integer('Updated', readonly=True)
+    failed_count = fields.Integer('Dead Letters', readonly=True)
+    fetch_seconds = fields.Float('Fetch Time (s)', readonly=True, digits=(16, 2))
+    ingest_seconds = fields.Float('Ingest Time (s)', readonly=True, digits=(16, 2))
+    error = fields.Text('Error', readonly=True)
+
+    @api.model
+    def _claim_pending(self, limit):
+        """Mark up to limit pending shards as running and commit, returning their ids"""
+        self.env.cr.execute(SQL("""
+            UPDATE voicenter_backfill_shard
+               SET state = 'running',
+                   started_at = (now() AT TIME ZONE 'UTC'),
+                   attempts = COALESCE(attempts, 0) + 1
+             WHERE id IN (
+                SELECT shard.id
+                  FROM voicenter_backfill_shard shard
+                  JOIN voicenter_backfill backfill ON backfill.id = shard.backfill_id
+                 WHERE shard.state = 'pending' AND backfill.state = 'running'
+              ORDER BY shard.date_from
+                 LIMIT %s
+                   FOR UPDATE OF shard SKIP LOCKED
+             )
+         RETURNING id
+        """, limit))
+        shard_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.env['voicenter.call.log']._commit_sync_progress()
+        self.invalidate_model()
+        return shard_ids
+
+    @api.model
+    def _recover_stale_shards(self):
+        """
+        Put shards left running by a crashed worker back in the queue
+
+        A live worker holds the advisory lock of its shard for as long as
+        it runs, however long that is; a shard whose lock is free has lost
+        its worker.
+        """
+        running = self.search([
+            ('state', '=', 'running'),
+            ('started_at', '<', datetime.now() - timedelta(minutes=STALE_SHARD_MINUTES)),
+        ])
+        stale = self.browse()
+        for shard in running:
+            with shard._shard_lock() as acquired:
+                if acquired:
+                    stale |= shard
+        if stale:
+            stale.write({'state': 'pending'})
+            _logger.warning(f"Requeued {len(stale)} stale Voicenter backfill shards")
+
+    @contextmanager
+    def _shard_lock(self, wait=False):
+        """
+        Hold the PostgreSQL advisory lock of a shard
+
+        The session-level lock is taken on a dedicated cursor, so it
+        survives the commits of the worker and is released when the
+        worker's connection goes away.
+
+        Args:
+            wait: block until the lock is free instead of giving up
+
+        Yields:
+            True when the lock was acquired, False when a worker holds it
+        """
+        self.ensure_one()
+        with self.env.registry.cursor() as lock_cr:
+            if wait:
+                lock_cr.execute(SQL("SELECT pg_advisory_lock(%s, %s)", SHARD_LOCK_NAMESPACE, self.id))
+                acquired = True
+            else:
+                lock_cr.execute(SQL("SELECT pg_try_advisory_lock(%s, %s)", SHARD_LOCK_NAMESPACE, self.id))
+                acquired = lock_cr.fetchone()[0]
+            # The lock outlives the transaction; don't stay idle in it
+            lock_cr.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    lock_cr.execute(SQL("SELECT pg_advisory_unlock(%s, %s)", SHARD_LOCK_NAMESPACE, self.id))
+
+    @api.model
+    def _run_in_new_cursor(self, shard_id, api_token, sync_state_id):
+        """
+        Run a shard from a worker thread, with its own cursor, environment
+        and API client, as the client's counters are not thread-safe
+        """
+        with self.env.registry.cursor() as cr:
+            env = api.Environment(cr, self.env.uid, self.env.context)
+            shard = env['voicenter.backfill.shard'].browse(shard_id)
+            client = env['voicenter.call.log']._get_voicenter_client(api_token)
+            with shard._shard_lock(wait=True):
+                shard._run(client, env['voicenter.sync.state'].sudo().browse(sync_state_id))
+                # The final state is committed before the lock is released
+                cr.commit()
+
+    def _run(self, client, sync_state):
+        """
+        Fetch and ingest one shard, recording timings or the error
+
+        Shards are fetched concurrently. Their CDRs are ingested batch by
+        batch under the account's sync lock, so live ingest is only held up
+        by a single batch.
+
+        Args:
+            client: VoicenterClient
+            sync_state: voicenter.sync.state of the account
+        """
+        self.ensure_one()
+        CallLog = self.env['voicenter.call.log']
+        started = time.monotonic()
+        try:
+            cdr_list = client.fetch_cdrs(self.date_from, self.date_to, CDR_FIELDS)
+            fetched = time.monotonic()
+            stats = CallLog._ingest_cdrs(cdr_list, sync_state=sync_state)
+        except Exception as e:
+            _logger.exception(f"Voicenter backfill shard {self.date_from} - {self.date_to} failed")
+            self.env.cr.rollback()
+            self.write({
+                'state': 'failed',
+                'error': str(e),
+                'finished_at': fields.Datetime.now(),
+            })
+            return
+
+        self.write({
+            'state': 'done',
+            'error': False,
+            'cdr_count': len(cdr_list),
+            'created_count': stats['created'],
+            'updated_count': stats['updated'],
+            'failed_count': stats['failed'],
+            'fetch_seconds': fetched - started,
+            'ingest_seconds': time.monotonic() - fetched,
+            'finished_at': fields.Datetime.now(),
+        })
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, tools
+from odoo.tools import SQL
+
+# Columns shared by the live and archived call logs, exposed by the history view
+HISTORY_FIELDS = [
+    'call_id', 'date', 'caller_number', 'target_number', 'duration', 'call_type',
+    'dial_status', 'record_url', 'representative_id', 'partner_id', 'lead_id',
+    'is_incoming', 'is_outgoing', 'is_answered', 'is_missed',
+]
+
+
+class VoicenterCallHistory(models.Model):
+    _name = 'voicenter.call.history'
+    _description = 'Voicenter Call History'
+    _auto = False
+    _order = 'date desc'
+    _rec_name = 'call_id'
+
+    source = fields.Selection([
+        ('live', 'Live'),
+        ('archive', 'Archive'),
+    ], string='Source', readonly=True)
+    res_id = fields.Integer('Record ID', readonly=True)
+
+    call_id = fields.Char('Call ID', readonly=True)
+    date = fields.Datetime('Call Date', readonly=True)
+    caller_number = fields.Char('Caller Number', readonly=True)
+    target_number = fields.Char('Target Number', readonly=True)
+    duration = fields.Integer('Duration (seconds)', readonly=True)
+    call_type = fields.Char('Call Type', readonly=True)
+    dial_status = fields.Char('Dial Status', readonly=True)
+    record_url = fields.Char('Recording URL', readonly=True)
+    representative_id = fields.Many2one('voicenter.representative', string='Representative', readonly=True)
+    partner_id = fields.Many2one('res.partner', string='Contact', readonly=True)
+    lead_id = fields.Many2one('crm.lead', string='Lead/Opportunity', readonly=True)
+    is_incoming = fields.Boolean('Incoming Call', readonly=True)
+    is_outgoing = fields.Boolean('Outgoing Call', readonly=True)
+    is_answered = fields.Boolean('Answered', readonly=True)
+    is_missed = fields.Boolean('Missed/Unanswered', readonly=True)
+
+    def init(self):
+        """Union of live and archived calls; ids are interleaved to stay unique"""
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        columns = SQL(', ').join(SQL.identifier(name) for name in HISTORY_FIELDS)
+        self.env.cr.execute(SQL("""
+            CREATE OR REPLACE VIEW %(view)s AS (
+                SELECT id * 2 AS id, 'live' AS source, id AS res_id, %(columns)s
+                  FROM voicenter_call_log
+                UNION ALL
+                SELECT id * 2 + 1 AS id, 'archive' AS source, id AS res_id, %(columns)s
+                  FROM voicenter_call_log_archive
+            )
+        """, view=SQL.identifier(self._table), columns=columns))
+
+    def action_open_call(self):
+        """Open the underlying live or archived call"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'voicenter.call.log' if self.source == 'live' else 'voicenter.call.log.archive',
+            'res_id': self.res_id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
@@ -1,13 +1,76 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api, _
+from odoo import models, fields, api, modules, _
 from odoo.exceptions import UserError
-import requests
+from odoo.osv import expression
+from odoo.tools import SQL
+from odoo.tools.sql import create_index, index_exists
 import logging
 from datetime import datetime, timedelta
+import cProfile
 import json
+import time
+from collections import defaultdict
+
+from ..tools.cdr import CDR_FIELD_MAP, CDR_DIMENSION_MAP, CDR_JSON_FIELD_MAP, get_cdr_hash, parse_cdr_date
+from ..tools.phone import normalize_phone
+from ..tools.sync_metrics import SyncMetrics
+from ..tools.voicenter_api import VOICENTER_API_URL, VoicenterClient
+from .voicenter_sync_state import LIVE_SYNC_LOCK_WAIT
 
 _logger = logging.getLogger(__name__)
 
+# All available fields from API
+CDR_FIELDS = [
+    "CallerNumber", "TargetNumber", "Date", "Duration",
+    "CallID", "Type", "CdrType", "DialStatus", "TargetExtension",
+    "CallerExtension", "DID", "QueueName", "RecordURL", "RecordExpect",
+    "Price", "RingTime", "RepresentativeName", "RepresentativeCode",
+    "UserName", "DTMFData", "CustomData", "DepartmentName",
+    "DepartmentId", "TargetPrefixName"
+]
+
+
+# Context for machine ingestion: call logs are created and updated without
+# tracking, followers or creation messages. Manual edits keep full chatter.
+INGEST_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+}
+
+# Call log fields the rollup is computed from, including the inputs of its
+# stored computed fields; changing them refreshes the call's hour
+STATS_SOURCE_FIELDS = frozenset([
+    'date', 'representative_id', 'department_id', 'queue_id', 'dial_status',
+    'cdr_type', 'call_type', 'duration', 'ring_time', 'price',
+    'is_incoming', 'is_outgoing', 'is_answered', 'is_missed',
+])
+
+# Seconds a scheduled catch-up may run before handing over to the next cron run
+CATCHUP_TIME_BUDGET = 240
+
+# Days of calls the full follow-up scan looks at; calls must stay live that long
+FOLLOWUP_WINDOW_DAYS = 7
+
+# Composite and partial indexes matching the module's hot queries:
+# (name, expressions, where)
+CALL_LOG_INDEXES = [
+    # Last answered call of a contact/lead (representative -> user assignment)
+    ('voicenter_call_log_partner_answered_date_idx',
+     ['partner_id', 'date DESC', 'id DESC'], 'is_answered AND partner_id IS NOT NULL'),
+    ('voicenter_call_log_lead_answered_date_idx',
+     ['lead_id', 'date DESC', 'id DESC'], 'is_answered AND lead_id IS NOT NULL'),
+    # Latest call of each contact, or of each lead without contact (follow-up detection)
+    ('voicenter_call_log_partner_date_idx',
+     ['partner_id', 'date DESC', 'id DESC'], 'partner_id IS NOT NULL'),
+    ('voicenter_call_log_lead_date_idx',
+     ['lead_id', 'date DESC', 'id DESC'], 'partner_id IS NULL AND lead_id IS NOT NULL'),
+    # "Needs Follow-up" filter, listed by date
+    ('voicenter_call_log_needs_followup_date_idx',
+     ['date DESC'], 'needs_followup'),
+]
+
 
 class VoicenterCallLog(models.Model):
     _name = 'voicenter.call.log'
@@ -41,23 +104,28 @@ class VoicenterCallLog(models.Model):
     record_expect = fields.Boolean('Recording Expected')
 
     # Representative/User info
-    representative_name = fields.Char('Representative Name')
-    representative_code = fields.Char('Representative Code')
-    user_name = fields.Char('User Name')
+    representative_id = fields.Many2one('voicenter.representative', string='Representative',
+                                        ondelete='restrict')
+    representative_name = fields.Char(related='representative_id.name', string='Representative Name')
+    representative_code = fields.Char(related='representative_id.code', string='Representative Code')
+    user_name = fields.Char(related='representative_id.user_name', string='User Name')
 
     # Department/Account
-    department_name = fields.Char('Department Name')
-    department_id_ext = fields.Integer('Department ID (External)')
+    department_id = fields.Many2one('voicenter.department', string='Department', ondelete='restrict')
+    department_name = fields.Char(related='department_id.name', string='Department Name')
+    department_id_ext = fields.Integer(related='department_id.external_id', string='Department ID (External)')
 
     # Queue info
-    queue_name = fields.Char('Queue Name')
+    queue_id = fields.Many2one('voicenter.queue', string='Queue', ondelete='restrict')
+    queue_name = fields.Char(related='queue_id.name', string='Queue Name')
 
     # Cost
     price = fields.Float('Price (Agorot)', digits=(16, 2),
                          help='Price in Israeli Agorot')
 
     # Destination
-    target_prefix_name = fields.Char('Destination Country')
+    destination_id = fields.Many2one('voicenter.destination', string='Destination', ondelete='restrict')
+    target_prefix_name = fields.Char(related='destination_id.name', string='Destination Country')
 
     # IVR and Custom Data
     dtmf_data = fields.Text('DTMF Data (JSON)')
@@ -69,11 +137,10 @@ class VoicenterCallLog(models.Model):
     lead_id = fields.Many2one('crm.lead', string='Lead/Opportunity', index=True,
                               ondelete='set null')
 
-    # Computed/helper fields
-    partner_name = fields.Char(
-        related='partner_id.name', string='Contact Name', store=True)
-    lead_name = fields.Char(related='lead_id.name',
-                            string='Lead Name', store=True)
+    # Computed/helper fields; not stored, so renaming a contact or lead does
+    # not rewrite its calls (searching goes through a join)
+    partner_name = fields.Char(related='partner_id.name', string='Contact Name')
+    lead_name = fields.Char(related='lead_id.name', string='Lead Name')
 
     # Call classification
     is_incoming = fields.Boolean(
@@ -92,11 +159,74 @@ class VoicenterCallLog(models.Model):
 
     # Sync tracking
     synced_at = fields.Datetime('Synced At', default=fields.Datetime.now)
+    cdr_hash = fields.Char('CDR Hash', copy=False,
+                           help='Content hash of the last CDR received for this call')
 
     _sql_constraints = [
         ('call_id_unique', 'UNIQUE(call_id)', 'Call ID must be unique!')
     ]
 
+    def init(self):
+        super().init()
+        self._create_call_log_indexes()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        calls = super().create(vals_list)
+        self.env['voicenter.call.stats'].sudo()._mark_hours_dirty(calls.mapped('date'))
+        return calls
+
+    def write(self, vals):
+        refresh_stats = not STATS_SOURCE_FIELDS.isdisjoint(vals)
+        old_dates = self.mapped('date') if refresh_stats else []
+        result = super().write(vals)
+        if refresh_stats:
+            self.env['voicenter.call.stats'].sudo()._mark_hours_dirty(old_dates + self.mapped('date'))
+        return result
+
+    def unlink(self):
+        # Archived calls keep counting through the archive table
+        if not self.env.context.get('voicenter_archiving'):
+            self.env['voicenter.call.stats'].sudo()._mark_hours_dirty(self.mapped('date'))
+        return super().unlink()
+
+    def _create_call_log_indexes(self):
+        """
+        Create the missing indexes of CALL_LOG_INDEXES
+
+        An index left invalid by an interrupted build is dropped and
+        created again.
+
+        Returns:
+            list of the names of the indexes that were created
+        """
+        for name in self._check_call_log_indexes():
+            self.env.cr.execute(SQL("DROP INDEX IF EXISTS %s", SQL.identifier(name)))
+        created = []
+        for name, expressions, where in CALL_LOG_INDEXES:
+            if not index_exists(self.env.cr, name):
+                create_index(self.env.cr, name, self._table, expressions, where=where)
+                created.append(name)
+        return created
+
+    @api.model
+    def _check_call_log_indexes(self):
+        """
+        Verify that every index of CALL_LOG_INDEXES exists and is valid
+
+        Returns:
+            list of the names of missing or invalid indexes
+        """
+        names = [name for name, _expressions, _where in CALL_LOG_INDEXES]
+        self.env.cr.execute(SQL("""
+            SELECT c.relname, i.indisvalid
+              FROM pg_index i
+              JOIN pg_class c ON c.oid = i.indexrelid
+             WHERE c.relname = ANY(%s)
+        """, names))
+        valid_by_name = dict(self.env.cr.fetchall())
+        return [name for name in names if not valid_by_name.get(name)]
+
     @api.depends('cdr_type', 'call_type')
     def _compute_call_direction(self):
         """Determine if call is incoming or outgoing based on CDR type"""
@@ -121,28 +251,50 @@ class VoicenterCallLog(models.Model):
             record.is_missed = record.dial_status in missed_statuses
 
     def _get_phone_numbers_from_call(self):
-        """Extract all possible phone numbers from a call record"""
+        """Extract the normalized phone numbers of a call, in matching order"""
         self.ensure_one()
-        phone_numbers = []
-
-        # Add caller number
-        if self.caller_number:
-            phone_numbers.append(self.caller_number)
-            # Also try without country code for Israeli numbers
-            if self.caller_number.startswith('972'):
-                phone_numbers.append('0' + self.caller_number[3:])
+        phone_numbers = [normalize_phone(self.caller_number)]
 
         # Add target number if it's a phone number (not extension)
         if self.target_number and self.target_number.isdigit():
-            phone_numbers.append(self.target_number)
-            if self.target_number.startswith('972'):
-                phone_numbers.append('0' + self.target_number[3:])
+            phone_numbers.append(normalize_phone(self.target_number))
 
         # Add DID
-        if self.did:
-            phone_numbers.append(self.did)
+        phone_numbers.append(normalize_phone(self.did))
 
-        return list(set(phone_numbers))  # Remove duplicates
+        # Remove empty values and duplicates, keeping the order
+        return list(dict.fromkeys(phone for phone in phone_numbers if phone))
+
+    @api.model
+    def _get_phone_index(self, model_name, phone_numbers):
+        """
+        Build a lookup table of normalized phone number -> record id
+
+        Args:
+            model_name: 'res.partner' or 'crm.lead'
+            phone_numbers: iterable of phone numbers (normalized or not)
+
+        Returns:
+            dict mapping normalized phone numbers to record ids, resolved
+            with a single query on the stored phone keys
+        """
+        phone_keys = list({normalize_phone(phone) for phone in phone_numbers} - {False})
+        if not phone_keys:
+            return {}
+
+        records = self.env[model_name].search_fetch([
+            '|',
+            ('voicenter_phone_key', 'in', phone_keys),
+            ('voicenter_mobile_key', 'in', phone_keys)
+        ], ['voicenter_phone_key', 'voicenter_mobile_key'], order='id')
+
+        # Oldest record wins when several share a number, phone before mobile
+        phone_index = {}
+        for record in records:
+            for key in (record.voicenter_phone_key, record.voicenter_mobile_key):
+                if key:
+                    phone_index.setdefault(key, record.id)
+        return phone_index
 
     @api.model
     def _match_partner(self, phone_numbers):
@@ -150,20 +302,11 @@ class VoicenterCallLog(models.Model):
         if not phone_numbers:
             return False
 
-        Partner = self.env['res.partner']
-
-        # Search in phone, mobile, and sanitized versions
+        phone_index = self._get_phone_index('res.partner', phone_numbers)
         for phone in phone_numbers:
-            # Try exact match first
-            partner = Partner.search([
-                '|', '|',
-                ('phone', '=', phone),
-                ('mobile', '=', phone),
-                ('phone', 'ilike', phone.replace(' ', '').replace('-', ''))
-            ], limit=1)
-
-            if partner:
-                return partner
+            partner_id = phone_index.get(normalize_phone(phone))
+            if partner_id:
+                return self.env['res.partner'].browse(partner_id)
 
         return False
 
@@ -173,67 +316,125 @@ class VoicenterCallLog(models.Model):
         if not phone_numbers:
             return False
 
-        Lead = self.env['crm.lead']
-
+        phone_index = self._get_phone_index('crm.lead', phone_numbers)
         for phone in phone_numbers:
-            lead = Lead.search([
-                '|',
-                ('phone', '=', phone),
-                ('mobile', '=', phone)
-            ], limit=1)
-
-            if lead:
-                return lead
+            lead_id = phone_index.get(normalize_phone(phone))
+            if lead_id:
+                return self.env['crm.lead'].browse(lead_id)
 
         return False
 
     def _link_to_contact_or_lead(self):
         """Link call to existing contact or lead, or create new lead if unknown"""
         self.ensure_one()
+        self._link_batch_to_contacts()
 
-        phone_numbers = self._get_phone_numbers_from_call()
-
-        if not phone_numbers:
-            _logger.warning(f"No phone numbers found in call {self.call_id}")
-            return
-
-        # Try to match existing partner
-        partner = self._match_partner(phone_numbers)
-        if partner:
-            self.partner_id = partner
-            _logger.info(
-                f"Call {self.call_id} linked to partner {partner.name}")
-            return
+    def _link_batch_to_contacts(self):
+        """
+        Link calls to existing contacts or leads, creating leads for unknown
+        incoming callers
 
-        # Try to match existing lead
-        lead = self._match_lead(phone_numbers)
-        if lead:
-            self.lead_id = lead
-            _logger.info(f"Call {self.call_id} linked to lead {lead.name}")
+        All phone numbers of the batch are resolved with one partner query
+        and one lead query. Unknown callers get a single new lead per number,
+        however many calls they made, and links are written grouped by
+        contact/lead.
+        """
+        if not self:
             return
 
-        # Create new lead for unknown number if it's an incoming call
-        if self.is_incoming:
-            lead_name = f"Missed Call - {self.caller_number or 'Unknown'}"
-
-            new_lead = self.env['crm.lead'].create({
-                'name': lead_name,
-                'phone': self.caller_number,
-                'type': 'lead',
-                'description': f"Missed phone call on {self.date.strftime('%Y-%m-%d %H:%M')}",
-            })
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        auto_create_leads = ICPSudo.get_param('voicenter.auto_create_leads', 'True')
+        auto_create_leads = auto_create_leads.lower() not in ('false', '0', 'no')
+
+        numbers_by_call = {}
+        for call in self:
+            phone_numbers = call._get_phone_numbers_from_call()
+            if phone_numbers:
+                numbers_by_call[call] = phone_numbers
+            else:
+                _logger.warning(f"No phone numbers found in call {call.call_id}")
+
+        all_numbers = {phone for numbers in numbers_by_call.values() for phone in numbers}
+        partner_index = self._get_phone_index('res.partner', all_numbers)
+
+        # Only numbers of calls without a partner need a lead lookup
+        unmatched_numbers = {
+            phone for numbers in numbers_by_call.values()
+            if not any(phone in partner_index for phone in numbers)
+            for phone in numbers
+        }
+        lead_index = self._get_phone_index('crm.lead', unmatched_numbers)
+
+        calls_by_partner = defaultdict(list)
+        calls_by_lead = defaultdict(list)
+        calls_by_unknown_number = defaultdict(list)
+
+        for call, phone_numbers in numbers_by_call.items():
+            partner_id = next(
+                (partner_index[phone] for phone in phone_numbers if phone in partner_index), False)
+            if partner_id:
+                calls_by_partner[partner_id].append(call.id)
+                continue
+
+            lead_id = next(
+                (lead_index[phone] for phone in phone_numbers if phone in lead_index), False)
+            if lead_id:
+                calls_by_lead[lead_id].append(call.id)
+                continue
+
+            # Create new lead for unknown number if it's an incoming call
+            caller_key = normalize_phone(call.caller_number)
+            if call.is_incoming and auto_create_leads and caller_key:
+                calls_by_unknown_number[caller_key].append(call)
+
+        # One lead per unknown number, described from its first call
+        if calls_by_unknown_number:
+            lead_vals_list = []
+            for calls in calls_by_unknown_number.values():
+                first_call = min(calls, key=lambda c: c.date)
+                lead_vals_list.append({
+                    'name': f"Missed Call - {first_call.caller_number}",
+                    'phone': first_call.caller_number,
+                    'type': 'lead',
+                    'description': f"Missed phone call on {first_call.date.strftime('%Y-%m-%d %H:%M')}",
+                })
+
+            # Leads are worked by people: create them with regular chatter
+            new_leads = self.env['crm.lead'].with_context(
+                **dict.fromkeys(INGEST_CONTEXT, False)).create(lead_vals_list)
+            for new_lead, calls in zip(new_leads, calls_by_unknown_number.values()):
+                calls_by_lead[new_lead.id].extend(call.id for call in calls)
+            _logger.info(f"Created {len(new_leads)} new leads for unknown callers")
+
+        CallLog = self.with_context(**INGEST_CONTEXT)
+        for partner_id, call_ids in calls_by_partner.items():
+            CallLog.browse(call_ids).write({'partner_id': partner_id})
+        for lead_id, call_ids in calls_by_lead.items():
+            CallLog.browse(call_ids).write({'lead_id': lead_id})
 
-            self.lead_id = new_lead
-            _logger.info(
-                f"Created new lead {new_lead.id} for call {self.call_id}")
+        _logger.info(
+            f"Linked {sum(map(len, calls_by_partner.values()))} calls to contacts and "
+            f"{sum(map(len, calls_by_lead.values()))} calls to leads")
 
     @api.model
-    def sync_from_voicenter(self, hours_back=24):
+    def sync_from_voicenter(self, hours_back=24, to_date=None, raise_if_locked=True):
         """
         Sync call logs from Voicenter API
 
+        The date range is fetched and ingested one time window at a time,
+        committing after each window, so memory stays bounded and windows
+        already ingested are kept if a later one fails. Only one sync per
+        Voicenter account runs at a time, guarded by an advisory lock.
+
         Args:
             hours_back: Number of hours to look back (default 24)
+            to_date: end of the range (naive UTC datetime), now by default
+            raise_if_locked: raise when another sync is running instead
+                of skipping
+
+        Returns:
+            True when the sync ran, False when it was skipped because
+            another sync holds the lock
         """
         ICPSudo = self.env['ir.config_parameter'].sudo()
         api_token = ICPSudo.get_param('voicenter.api_token')
@@ -243,235 +444,552 @@ class VoicenterCallLog(models.Model):
             _logger.error(error_msg)
             raise UserError(_(error_msg))
 
-        # Determine date range
-        to_date = datetime.now()
-        from_date = to_date - timedelta(hours=hours_back)
-
-        # Check last sync to avoid duplicates
-        last_call = self.search([], order='date desc', limit=1)
-        if last_call and last_call.date:
-            # Add 1 minute to last call date to avoid duplicates
-            from_date = max(from_date, last_call.date + timedelta(minutes=1))
+        sync_state = self.env['voicenter.sync.state'].sudo()._get_for_token(api_token)
+        with sync_state._sync_lock(wait=LIVE_SYNC_LOCK_WAIT) as acquired:
+            if not acquired:
+                if raise_if_locked:
+                    raise UserError(_("Another Voicenter sync is already running. Please try again in a few minutes."))
+                _logger.info("Voicenter sync skipped: another sync is already running")
+                return False
+
+            # Start from a fresh snapshot, so the watermark left by the
+            # previous holder of the lock is seen
+            self._commit_sync_progress()
+            sync_state.invalidate_recordset()
+
+            # Determine date range
+            to_date = to_date or datetime.now()
+            from_date = to_date - timedelta(hours=hours_back)
+
+            # Resume from the watermark; the overlap picks up late CDRs and
+            # re-fetched calls are skipped by the upsert when unchanged
+            from_date = sync_state._get_sync_start(from_date)
+            self._sync_range(api_token, sync_state, from_date, to_date)
+        return True
 
-        # Format dates for API (ISO 8601, GMT 0)
-        from_date_str = from_date.strftime("%Y-%m-%dT%H:%M:%S")
-        to_date_str = to_date.strftime("%Y-%m-%dT%H:%M:%S")
+    @api.model
+    def _sync_range(self, api_token, sync_state, from_date, to_date):
+        """
+        Fetch and ingest the calls of a date range, recording a sync run
 
+        Args:
+            api_token: Voicenter API token
+            sync_state: voicenter.sync.state of the token, advanced as
+                windows are ingested
+            from_date: start of the range (naive UTC datetime)
+            to_date: end of the range (naive UTC datetime)
+        """
         _logger.info(
-            f"Syncing Voicenter calls from {from_date_str} to {to_date_str}")
-
-        # Prepare API request
-        url = "https://api.voicenter.com/hub/cdr/"
-
-        # All available fields from API
-        fields_list = [
-            "CallerNumber", "TargetNumber", "Date", "Duration",
-            "CallID", "Type", "CdrType", "DialStatus", "TargetExtension",
-            "CallerExtension", "DID", "QueueName", "RecordURL", "RecordExpect",
-            "Price", "RingTime", "RepresentativeName", "RepresentativeCode",
-            "UserName", "DTMFData", "CustomData", "DepartmentName",
-            "DepartmentId", "TargetPrefixName"
-        ]
-
-        payload = {
-            "code": api_token,
-            "fields": fields_list,
-            "search": {
-                "fromdate": from_date_str,
-                "todate": to_date_str
-            },
-            "sort": [{
-                "field": "date",
-                "order": "desc"
-            }]
-        }
+            f"Syncing Voicenter calls from {from_date:%Y-%m-%dT%H:%M:%S} to {to_date:%Y-%m-%dT%H:%M:%S}")
+
+        stats = self._new_ingest_stats()
+        SyncRun = self.env['voicenter.sync.run'].sudo()
+        metrics = SyncMetrics(self.env.cr)
+        profiler = cProfile.Profile() if SyncRun._is_profiling_enabled() else None
+        error = False
 
+        client = self._get_voicenter_client(api_token)
+        if profiler:
+            profiler.enable()
         try:
-            _logger.info(f"Making API request to {url}")
-            response = requests.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            for window_start, window_end, cdr_list in self._fetch_cdr_windows(
+                    client, from_date, to_date, metrics=metrics):
+                with metrics.stage('ingest'):
+                    self._merge_ingest_stats(stats, self._ingest_cdrs(cdr_list, commit=True))
+                sync_state._advance_watermark(window_start, window_end)
+                self._commit_sync_progress()
 
-            if data.get('ERROR_NUMBER', 0) != 0:
-                error_msg = f"Voicenter API error: {data.get('ERROR_DESCRIPTION', 'Unknown error')}"
-                _logger.error(error_msg)
-                raise UserError(_(error_msg))
+            sync_state.last_sync_at = fields.Datetime.now()
 
-            cdr_list = data.get('CDR_LIST', [])
-            _logger.info(f"Successfully retrieved {len(cdr_list)} calls from Voicenter API")
+            _logger.info(
+                f"Voicenter sync completed: {stats['created']} created, {stats['updated']} updated, "
+                f"{stats['skipped']} unchanged, {stats['failed']} failed")
 
-            created_count = 0
-            updated_count = 0
+            # After sync, identify unclosed calls among the contacts/leads just called
+            with metrics.stage('identify'):
+                self._identify_unclosed_calls(self.browse(stats['call_ids']))
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            if profiler:
+                profiler.disable()
+            SyncRun._record_run(from_date, to_date, metrics, client, stats, error=error, profiler=profiler)
 
-            for cdr in cdr_list:
-                call_vals = self._prepare_call_values(cdr)
+    @api.model
+    def _get_fetch_window_minutes(self):
+        """Length of the time windows the sync range is fetched in"""
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        try:
+            window_minutes = int(ICPSudo.get_param('voicenter.fetch_window_minutes', 60))
+        except (TypeError, ValueError):
+            window_minutes = 60
+        return max(window_minutes, 1)
+
+    @api.model
+    def _get_voicenter_client(self, api_token):
+        """Return the API client used for all Voicenter requests"""
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        base_url = ICPSudo.get_param('voicenter.api_base_url') or VOICENTER_API_URL
+        return VoicenterClient(api_token, base_url=base_url)
 
-                # Check if call already exists
-                existing_call = self.search(
-                    [('call_id', '=', call_vals['call_id'])], limit=1)
+    @api.model
+    def _fetch_cdr_windows(self, client, from_date, to_date, metrics=None):
+        """
+        Fetch CDRs from Voicenter one time window at a time
 
-                if existing_call:
-                    existing_call.write(call_vals)
-                    updated_count += 1
-                else:
-                    new_call = self.create(call_vals)
-                    new_call._link_to_contact_or_lead()
-                    created_count += 1
+        Args:
+            client: VoicenterClient
+            from_date: start of the range (naive UTC datetime)
+            to_date: end of the range (naive UTC datetime)
+            metrics: SyncMetrics the fetch time and CDR count are added to
 
+        Yields:
+            (window_start, window_end, cdr_list) tuples in chronological order
+        """
+        window = timedelta(minutes=self._get_fetch_window_minutes())
+        window_start = from_date
+
+        while window_start < to_date:
+            window_end = min(window_start + window, to_date)
+            if metrics:
+                with metrics.stage('fetch'):
+                    cdr_list = client.fetch_cdrs(window_start, window_end, CDR_FIELDS)
+                metrics.cdr_count += len(cdr_list)
+            else:
+                cdr_list = client.fetch_cdrs(window_start, window_end, CDR_FIELDS)
             _logger.info(
-                f"Voicenter sync completed: {created_count} created, {updated_count} updated")
+                f"Retrieved {len(cdr_list)} calls from Voicenter API for "
+                f"{window_start:%Y-%m-%dT%H:%M:%S} - {window_end:%Y-%m-%dT%H:%M:%S}")
+            yield window_start, window_end, cdr_list
+            window_start = window_end
 
-            # After sync, identify unclosed calls
-            self._identify_unclosed_calls()
+    @api.model
+    def _commit_sync_progress(self):
+        """Commit the work done so far, except when running tests"""
+        if not modules.module.current_test:
+            self.env.cr.commit()
 
-        except requests.exceptions.Timeout:
-            error_msg = "Voicenter API request timed out. Please check your internet connection or try again later."
-            _logger.error(f"API timeout: {error_msg}")
-            raise UserError(_(error_msg))
-        except requests.exceptions.ConnectionError:
-            error_msg = "Could not connect to Voicenter API. Please check your internet connection."
-            _logger.error(f"Connection error: {error_msg}")
-            raise UserError(_(error_msg))
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Network error while syncing from Voicenter: {str(e)}"
-            _logger.error(error_msg)
-            raise UserError(_(error_msg))
-        except ValueError as e:
-            error_msg = f"Invalid response from Voicenter API: {str(e)}"
-            _logger.error(error_msg)
-            raise UserError(_(error_msg))
+    @api.model
+    def _get_sync_batch_size(self):
+        """Number of CDRs upserted per batch during sync"""
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        try:
+            batch_size = int(ICPSudo.get_param('voicenter.sync_batch_size', 500))
+        except (TypeError, ValueError):
+            batch_size = 500
+        return max(batch_size, 1)
+
+    @api.model
+    def _ingest_cdrs(self, cdr_list, commit=False, sync_state=None):
+        """
+        Upsert a list of CDRs in batches
+
+        A batch that fails is retried one CDR at a time, each in its own
+        savepoint; CDRs that still fail are stored as dead letters and the
+        rest of the list is ingested normally.
+
+        Args:
+            cdr_list: list of CDR dicts as returned by the Voicenter API
+            commit: commit after each batch, releasing locks early
+            sync_state: voicenter.sync.state whose sync lock is taken for
+                each batch, for callers that do not hold it; each batch is
+                then committed before the lock is released
+
+        Returns:
+            dict with 'created', 'updated', 'skipped' and 'failed' counts,
+            the 'call_ids' of created and updated calls, and the time and
+            queries spent matching new calls to contacts
+            ('match_seconds', 'match_queries')
+        """
+        stats = self._new_ingest_stats()
+        batch_size = self._get_sync_batch_size()
+
+        for start in range(0, len(cdr_list), batch_size):
+            cdr_batch = cdr_list[start:start + batch_size]
+            if sync_state:
+                with sync_state._sync_lock(wait=True):
+                    # Start from a fresh snapshot, so calls written by the previous holder are seen
+                    self._commit_sync_progress()
+                    batch_stats = self._ingest_cdr_batch(cdr_batch)
+                    self._commit_sync_progress()
+            else:
+                batch_stats = self._ingest_cdr_batch(cdr_batch)
+                if commit:
+                    self._commit_sync_progress()
+            self._merge_ingest_stats(stats, batch_stats)
+
+        return stats
+
+    @api.model
+    def _new_ingest_stats(self):
+        """Empty ingest statistics, see _ingest_cdrs()"""
+        return {'created': 0, 'updated': 0, 'skipped': 0, 'failed': 0, 'call_ids': [],
+                'match_seconds': 0.0, 'match_queries': 0}
 
     @api.model
-    def _prepare_call_values(self, cdr):
-        """Convert API CDR data to Odoo field values"""
-        # Parse date
-        date_str = cdr.get('Date')
-        call_date = False
-        if date_str:
-            try:
-                call_date = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-            except:
-                try:
-                    call_date = datetime.strptime(
-                        date_str, "%Y-%m-%d %H:%M:%S")
-                except:
-                    _logger.warning(f"Could not parse date: {date_str}")
+    def _merge_ingest_stats(self, stats, other_stats):
+        """Add other_stats to stats in place"""
+        for key, value in other_stats.items():
+            stats[key] += value
+
+    @api.model
+    def _ingest_cdr_batch(self, cdr_batch):
+        """Upsert one batch of CDRs, isolating the CDRs that fail"""
+        DeadLetter = self.env['voicenter.cdr.dead.letter'].sudo()
+        stats = self._new_ingest_stats()
+
+        # CDRs without a call ID can never be stored
+        valid_cdrs = []
+        for cdr in cdr_batch:
+            if isinstance(cdr, dict) and cdr.get('CallID'):
+                valid_cdrs.append(cdr)
+            else:
+                DeadLetter._record(cdr, "Missing CallID")
+                stats['failed'] += 1
+        if not valid_cdrs:
+            return stats
+
+        try:
+            with self.env.cr.savepoint():
+                self._merge_ingest_stats(stats, self._upsert_cdr_batch(valid_cdrs))
+            # CDRs that failed before and went through now are no longer dead letters
+            DeadLetter._clear_ingested({str(cdr['CallID']) for cdr in valid_cdrs})
+            return stats
+        except Exception as e:
+            if len(valid_cdrs) == 1:
+                _logger.warning(f"Failed to ingest Voicenter call {valid_cdrs[0].get('CallID')}: {e}")
+                DeadLetter._record(valid_cdrs[0], str(e))
+                stats['failed'] += 1
+                return stats
+
+        _logger.warning(f"Batch of {len(valid_cdrs)} CDRs failed, retrying them one by one")
+        for cdr in valid_cdrs:
+            self._merge_ingest_stats(stats, self._ingest_cdr_batch([cdr]))
+        return stats
+
+    @api.model
+    def _upsert_cdr_batch(self, cdr_batch):
+        """
+        Upsert one batch of CDRs: a single lookup for existing call IDs,
+        one multi-record create for new calls and grouped writes for
+        changed ones. Calls whose values did not change are not written;
+        the new CDR hashes of existing calls are stored with one UPDATE.
+        """
+        CallLog = self.with_context(**INGEST_CONTEXT)
+        synced_at = fields.Datetime.now()
+
+        # Later occurrences of the same call ID within the batch win
+        cdr_by_call_id = {str(cdr['CallID']): cdr for cdr in cdr_batch}
+
+        existing_calls = self.search_fetch(
+            [('call_id', 'in', list(cdr_by_call_id))], ['call_id', 'cdr_hash'])
+        existing_by_call_id = {call.call_id: call for call in existing_calls}
+
+        # Calls already moved to the archive are not recreated
+        new_call_ids = [call_id for call_id in cdr_by_call_id if call_id not in existing_by_call_id]
+        archived_call_ids = set(self.env['voicenter.call.log.archive'].sudo().search_fetch(
+            [('call_id', 'in', new_call_ids)], ['call_id']).mapped('call_id')) if new_call_ids else set()
+
+        to_map = []
+        to_create = []
+        to_write = defaultdict(list)
+        new_hashes = {}
+        skipped = 0
+
+        for call_id, cdr in cdr_by_call_id.items():
+            cdr_hash = get_cdr_hash(cdr)
+            existing_call = existing_by_call_id.get(call_id)
+
+            # Re-synced calls whose CDR is unchanged are skipped before mapping
+            if call_id in archived_call_ids or (existing_call and existing_call.cdr_hash == cdr_hash):
+                skipped += 1
+                continue
+            to_map.append((cdr, cdr_hash, existing_call))
+
+        dimension_ids = self._resolve_cdr_dimensions([cdr for cdr, _cdr_hash, _call in to_map])
+        for cdr, cdr_hash, existing_call in to_map:
+            call_vals = self._prepare_call_values(
+                cdr, synced_at=synced_at, cdr_hash=cdr_hash, dimension_ids=dimension_ids)
+            if not existing_call:
+                to_create.append(call_vals)
+                continue
+
+            # The hash differs for every call here; keeping it out of the
+            # changes lets calls with the same changes share a write
+            call_vals.pop('cdr_hash')
+            new_hashes[existing_call.id] = cdr_hash
+            changes = existing_call._get_changed_call_values(call_vals)
+            if not changes:
+                skipped += 1
+                continue
+
+            changes['synced_at'] = synced_at
+            to_write[tuple(sorted(changes.items()))].append(existing_call.id)
+
+        # Calls sharing the exact same changes are written together
+        for changes, call_ids in to_write.items():
+            CallLog.browse(call_ids).write(dict(changes))
+        if new_hashes:
+            self._store_cdr_hashes(new_hashes)
+
+        new_calls = self.browse()
+        match_seconds, match_queries = 0.0, 0
+        if to_create:
+            new_calls = CallLog.create(to_create)
+            match_started, queries_before = time.perf_counter(), self.env.cr.sql_log_count
+            new_calls._link_batch_to_contacts()
+            match_seconds = time.perf_counter() - match_started
+            match_queries = self.env.cr.sql_log_count - queries_before
+
+        updated_ids = [call_id for call_ids in to_write.values() for call_id in call_ids]
+
+        # Recordings announced without a URL yet are re-fetched later
+        self.env['voicenter.recording.pending'].sudo()._enqueue(new_calls | self.browse(updated_ids))
 
         return {
-            'call_id': cdr.get('CallID'),
-            'date': call_date,
-            'caller_number': cdr.get('CallerNumber'),
-            'target_number': cdr.get('TargetNumber'),
-            'caller_extension': cdr.get('CallerExtension'),
-            'target_extension': cdr.get('TargetExtension'),
-            'did': cdr.get('DID'),
-            'duration': cdr.get('Duration', 0),
-            'ring_time': cdr.get('RingTime', 0),
-            'call_type': cdr.get('Type'),
-            'cdr_type': cdr.get('CdrType'),
-            'dial_status': cdr.get('DialStatus'),
-            'record_url': cdr.get('RecordURL'),
-            'record_expect': cdr.get('RecordExpect', False),
-            'representative_name': cdr.get('RepresentativeName'),
-            'representative_code': cdr.get('RepresentativeCode'),
-            'user_name': cdr.get('UserName'),
-            'department_name': cdr.get('DepartmentName'),
-            'department_id_ext': cdr.get('DepartmentId'),
-            'queue_name': cdr.get('QueueName'),
-            'price': cdr.get('Price', 0.0),
-            'target_prefix_name': cdr.get('TargetPrefixName'),
-            'dtmf_data': json.dumps(cdr.get('DTMFData', []), ensure_ascii=False) if cdr.get('DTMFData') else False,
-            'custom_data': json.dumps(cdr.get('CustomData', {}), ensure_ascii=False) if cdr.get('CustomData') else False,
-            'synced_at': fields.Datetime.now(),
+            'created': len(new_calls),
+            'updated': len(updated_ids),
+            'skipped': skipped,
+            'failed': 0,
+            'call_ids': new_calls.ids + updated_ids,
+            'match_seconds': match_seconds,
+            'match_queries': match_queries,
         }
 
     @api.model
-    def _identify_unclosed_calls(self):
+    def _store_cdr_hashes(self, hash_by_id):
+        """
+        Store the CDR hashes of existing calls with a single UPDATE
+
+        Args:
+            hash_by_id: dict mapping call log id to its new CDR hash
+        """
+        self.flush_model(['cdr_hash'])
+        self.env.cr.execute(SQL("""
+            UPDATE voicenter_call_log AS call
+               SET cdr_hash = new.cdr_hash
+              FROM (VALUES %s) AS new (id, cdr_hash)
+             WHERE call.id = new.id
+        """, SQL(', ').join(SQL("(%s, %s)", call_id, cdr_hash) for call_id, cdr_hash in hash_by_id.items())))
+        self.invalidate_model(['cdr_hash'])
+
+    def _get_changed_call_values(self, call_vals):
+        """Return the subset of call_vals that differs from the stored values"""
+        self.ensure_one()
+        changes = {}
+        for name, value in call_vals.items():
+            if name == 'synced_at':
+                continue
+            field = self._fields[name]
+            new_value = field.convert_to_record(
+                field.convert_to_cache(value, self), self)
+            if new_value != self[name]:
+                changes[name] = value
+        return changes
+
+    @api.model
+    def _resolve_cdr_dimensions(self, cdrs):
+        """
+        Resolve the dimension values of CDRs to lookup table ids
+
+        Unknown values are registered, with one lookup per dimension for
+        the whole batch.
+
+        Args:
+            cdrs: list of CDR dicts
+
+        Returns:
+            dict mapping call log field to a dict mapping dimension key to id
+        """
+        dimension_ids = {}
+        for field_name, model_name, cdr_key, value_keys in CDR_DIMENSION_MAP:
+            values_by_key = {}
+            for cdr in cdrs:
+                key = cdr.get(cdr_key)
+                if key and str(key) not in values_by_key:
+                    values_by_key[str(key)] = {
+                        name: cdr.get(value_key) or False for name, value_key in value_keys.items()
+                    }
+            dimension_ids[field_name] = (
+                self.env[model_name]._resolve_dimension_ids(values_by_key) if values_by_key else {})
+        return dimension_ids
+
+    @api.model
+    def _prepare_call_values(self, cdr, synced_at=None, cdr_hash=None, dimension_ids=None):
+        """
+        Convert API CDR data to Odoo field values
+
+        Args:
+            cdr: CDR dict
+            synced_at: sync timestamp, shared by all CDRs of a batch
+            cdr_hash: content hash of the CDR, computed when not given
+            dimension_ids: dimension ids resolved for the batch, see
+                _resolve_cdr_dimensions(); resolved here when not given
+        """
+        if dimension_ids is None:
+            dimension_ids = self._resolve_cdr_dimensions([cdr])
+        call_id = cdr.get('CallID')
+        call_vals = {
+            'call_id': str(call_id) if call_id else call_id,
+            'date': parse_cdr_date(cdr.get('Date')),
+            'synced_at': synced_at or fields.Datetime.now(),
+            'cdr_hash': cdr_hash or get_cdr_hash(cdr),
+        }
+        for field_name, cdr_key, default in CDR_FIELD_MAP:
+            call_vals[field_name] = cdr.get(cdr_key, default)
+        for field_name, _model_name, cdr_key, _value_keys in CDR_DIMENSION_MAP:
+            key = cdr.get(cdr_key)
+            call_vals[field_name] = dimension_ids[field_name][str(key)] if key else False
+        for field_name, cdr_key in CDR_JSON_FIELD_MAP:
+            value = cdr.get(cdr_key)
+            call_vals[field_name] = json.dumps(value, ensure_ascii=False) if value else False
+        return call_vals
+
+    @api.model
+    def _identify_unclosed_calls(self, calls=None):
         """
         Identify call series that are "unclosed" (last call was unanswered)
         This marks calls that need follow-up
+
+        Args:
+            calls: calls just ingested; only their contacts/leads are
+                re-evaluated. All contacts/leads with calls in the last
+                FOLLOWUP_WINDOW_DAYS days are evaluated when not given.
         """
-        # Get all partners and leads with calls in the last 7 days
-        week_ago = datetime.now() - timedelta(days=7)
+        week_ago = datetime.now() - timedelta(days=FOLLOWUP_WINDOW_DAYS)
 
-        recent_calls = self.search([
-            ('date', '>=', week_ago),
-            '|',
-            ('partner_id', '!=', False),
-            ('lead_id', '!=', False)
-        ])
-
-        # Group by partner/lead
-        entities = {}
-        for call in recent_calls:
-            key = ('partner', call.partner_id.id) if call.partner_id else (
-                'lead', call.lead_id.id)
-            if key not in entities:
-                entities[key] = []
-            entities[key].append(call)
-
-        # Check each entity's call series
-        for entity_key, calls in entities.items():
-            # Sort by date descending
-            sorted_calls = sorted(calls, key=lambda c: c.date, reverse=True)
-
-            # Check if most recent call was unanswered
-            most_recent = sorted_calls[0]
-
-            if most_recent.is_missed and not most_recent.followup_done:
-                most_recent.needs_followup = True
-                _logger.info(
-                    f"Marked call {most_recent.call_id} as needing follow-up")
-
-                # Optionally create activity for follow-up
-                if most_recent.partner_id:
-                    self._create_followup_activity(
-                        most_recent, most_recent.partner_id)
-                elif most_recent.lead_id:
-                    self._create_followup_activity(
-                        most_recent, most_recent.lead_id)
+        # Calls are grouped by partner, or by lead when there is no partner
+        if calls is None:
+            partner_filter = SQL("partner_id IS NOT NULL")
+            lead_filter = SQL("lead_id IS NOT NULL")
+        else:
+            partner_ids = calls.partner_id.ids
+            lead_ids = calls.filtered(lambda c: not c.partner_id).lead_id.ids
+            if not partner_ids and not lead_ids:
+                return
+            partner_filter = SQL("partner_id = ANY(%s)", partner_ids)
+            lead_filter = SQL("lead_id = ANY(%s)", lead_ids)
+
+        # Most recent call of each series, kept when it was missed
+        self.flush_model(['partner_id', 'lead_id', 'date', 'is_missed', 'followup_done'])
+        self.env.cr.execute(SQL("""
+            SELECT id FROM (
+                SELECT DISTINCT ON (partner_id) id, is_missed, followup_done
+                  FROM voicenter_call_log
+                 WHERE date >= %(week_ago)s AND %(partner_filter)s
+              ORDER BY partner_id, date DESC, id DESC
+            ) AS latest_partner_call
+             WHERE is_missed AND followup_done IS NOT TRUE
+            UNION ALL
+            SELECT id FROM (
+                SELECT DISTINCT ON (lead_id) id, is_missed, followup_done
+                  FROM voicenter_call_log
+                 WHERE date >= %(week_ago)s AND partner_id IS NULL AND %(lead_filter)s
+              ORDER BY lead_id, date DESC, id DESC
+            ) AS latest_lead_call
+             WHERE is_missed AND followup_done IS NOT TRUE
+        """, week_ago=week_ago, partner_filter=partner_filter, lead_filter=lead_filter))
+        unclosed_calls = self.browse([row[0] for row in self.env.cr.fetchall()])
+
+        to_mark = unclosed_calls.filtered(lambda c: not c.needs_followup)
+        if to_mark:
+            to_mark.with_context(**INGEST_CONTEXT).needs_followup = True
+            _logger.info(f"Marked {len(to_mark)} calls as needing follow-up")
+
+        # Optionally create activity for follow-up
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        create_activities = ICPSudo.get_param('voicenter.create_activities', 'True')
+        if unclosed_calls and create_activities.lower() not in ('false', '0', 'no'):
+            self._create_followup_activities(unclosed_calls)
 
     def _create_followup_activity(self, call, record):
         """Create a follow-up activity for a missed call, assigned to most recent user who spoke with them"""
-        Activity = self.env['mail.activity']
+        self._create_followup_activities(call)
 
-        # Check if activity already exists
-        existing = Activity.search([
-            ('res_model', '=', record._name),
-            ('res_id', '=', record.id),
-            ('summary', '=', 'Missed Phone Call')
-        ], limit=1)
+    @api.model
+    def _create_followup_activities(self, calls):
+        """
+        Create follow-up activities for a set of missed calls in bulk
 
-        if existing:
-            return
+        The activity is created on the call's contact, or on its lead when
+        there is no contact, unless that record already has a "Missed Phone
+        Call" activity. Existing activities, assignees and model ids are
+        resolved once for the whole set and all activities are created
+        with a single create().
+
+        Args:
+            calls: missed calls, each the most recent call of its series
+        """
+        Activity = self.env['mail.activity']
 
         activity_type = self.env.ref(
             'mail.mail_activity_data_call', raise_if_not_found=False)
         if not activity_type:
             activity_type = self.env['mail.activity.type'].search(
                 [('name', '=', 'Call')], limit=1)
+        if not activity_type:
+            return
 
-        # SMART ASSIGNMENT: Find most recent user who successfully spoke with this contact
-        assigned_user = self._find_most_recent_user_for_contact(record)
+        call_by_record = {}
+        for call in calls:
+            record = call.partner_id or call.lead_id
+            if record:
+                call_by_record.setdefault(record, call)
+        if not call_by_record:
+            return
+
+        # Check which records already have an activity
+        ids_by_model = defaultdict(list)
+        for record in call_by_record:
+            ids_by_model[record._name].append(record.id)
+        existing = Activity.search_fetch(expression.AND([
+            [('summary', '=', 'Missed Phone Call')],
+            expression.OR([
+                [('res_model', '=', model_name), ('res_id', 'in', record_ids)]
+                for model_name, record_ids in ids_by_model.items()
+            ]),
+        ]), ['res_model', 'res_id'])
+        existing_keys = {(activity.res_model, activity.res_id) for activity in existing}
+
+        call_by_record = {
+            record: call for record, call in call_by_record.items()
+            if (record._name, record.id) not in existing_keys
+        }
+        if not call_by_record:
+            return
+
+        # SMART ASSIGNMENT: Find most recent user who successfully spoke with each contact
+        assigned_users = self._find_most_recent_users_for_contacts(list(call_by_record))
+        model_ids = {
+            model_name: self.env['ir.model']._get_id(model_name)
+            for model_name in ids_by_model
+        }
+        today = fields.Date.today()
 
-        if activity_type:
+        activity_vals_list = []
+        for record, call in call_by_record.items():
             # Format phone number as clickable
             phone_html = f'<a href="tel:{call.caller_number}">{call.caller_number}</a>'
 
             activity_vals = {
-                'res_model_id': self.env['ir.model']._get(record._name).id,
+                'res_model_id': model_ids[record._name],
                 'res_id': record.id,
                 'activity_type_id': activity_type.id,
                 'summary': 'Missed Phone Call',
                 'note': f'From: {phone_html}',
-                'date_deadline': fields.Date.today(),
+                'date_deadline': today,
             }
 
             # Assign to the user if found
+            assigned_user = assigned_users.get(record)
             if assigned_user:
                 activity_vals['user_id'] = assigned_user.id
 
-            Activity.create(activity_vals)
+            activity_vals_list.append(activity_vals)
+
+        Activity.create(activity_vals_list)
+        _logger.info(f"Created {len(activity_vals_list)} follow-up activities")
 
     def _find_most_recent_user_for_contact(self, record):
         """
@@ -483,40 +1001,81 @@ class VoicenterCallLog(models.Model):
         Returns:
             res.users record or False
         """
-        # Build domain based on record type
-        if record._name == 'res.partner':
-            domain = [('partner_id', '=', record.id)]
-        elif record._name == 'crm.lead':
-            domain = [('lead_id', '=', record.id)]
-        else:
+        if record._name not in ('res.partner', 'crm.lead'):
             return False
+        return self._find_most_recent_users_for_contacts([record]).get(record, False)
 
-        # Find most recent ANSWERED call
-        recent_answered_call = self.search(
-            domain + [('is_answered', '=', True)],
-            order='date desc',
-            limit=1
-        )
+    @api.model
+    def _find_most_recent_users_for_contacts(self, records):
+        """
+        Batch version of _find_most_recent_user_for_contact()
 
-        if not recent_answered_call:
-            return False
+        The last answered call of every contact/lead comes from a single
+        query over live and archived calls, and representatives are
+        matched to users through the representative mapping.
 
-        # Get the representative/user from that call
-        if recent_answered_call.representative_code:
-            # Try to match representative to Odoo user
-            # You might need to adjust this based on how your users are set up
-            user = self.env['res.users'].search([
-                ('name', '=', recent_answered_call.representative_name)
-            ], limit=1)
+        Args:
+            records: list of res.partner and crm.lead records
 
-            if user:
-                return user
+        Returns:
+            dict mapping each record to a res.users record or False
+        """
+        partner_ids = [record.id for record in records if record._name == 'res.partner']
+        lead_ids = [record.id for record in records if record._name == 'crm.lead']
+
+        # Find most recent ANSWERED call of each contact/lead
+        self.flush_model(['partner_id', 'lead_id', 'date', 'is_answered', 'representative_id'])
+        self.env.cr.execute(SQL("""
+            SELECT 'res.partner', partner_id, representative_id FROM (
+                SELECT DISTINCT ON (partner_id) partner_id, representative_id
+                  FROM (
+                        SELECT partner_id, representative_id, date, id, 1 AS live
+                          FROM voicenter_call_log
+                         WHERE is_answered AND partner_id = ANY(%(partner_ids)s)
+                         UNION ALL
+                        SELECT partner_id, representative_id, date, id, 0 AS live
+                          FROM voicenter_call_log_archive
+                         WHERE is_answered AND partner_id = ANY(%(partner_ids)s)
+                       ) AS answered_calls
+              ORDER BY partner_id, date DESC, live DESC, id DESC
+            ) AS last_partner_call
+            UNION ALL
+            SELECT 'crm.lead', lead_id, representative_id FROM (
+                SELECT DISTINCT ON (lead_id) lead_id, representative_id
+                  FROM (
+                        SELECT lead_id, representative_id, date, id, 1 AS live
+                          FROM voicenter_call_log
+                         WHERE is_answered AND lead_id = ANY(%(lead_ids)s)
+                         UNION ALL
+                        SELECT lead_id, representative_id, date, id, 0 AS live
+                          FROM voicenter_call_log_archive
+                         WHERE is_answered AND lead_id = ANY(%(lead_ids)s)
+                       ) AS answered_calls
+              ORDER BY lead_id, date DESC, live DESC, id DESC
+            ) AS last_lead_call
+        """, partner_ids=partner_ids, lead_ids=lead_ids))
+        last_answered = {
+            (model_name, record_id): representative_id
+            for model_name, record_id, representative_id in self.env.cr.fetchall()
+        }
 
-        # Fallback: try to get user from contact/lead
-        if hasattr(record, 'user_id') and record.user_id:
-            return record.user_id
+        # Match representatives to Odoo users through the representative mapping
+        Representative = self.env['voicenter.representative'].sudo()
+        Representative.browse([rep_id for rep_id in last_answered.values() if rep_id]).fetch(['user_id'])
 
-        return False
+        result = {}
+        for record in records:
+            if (record._name, record.id) not in last_answered:
+                result[record] = False
+                continue
+
+            representative_id = last_answered[(record._name, record.id)]
+            user = representative_id and Representative.browse(representative_id).user_id
+
+            # Fallback: try to get user from contact/lead
+            result[record] = user or record.user_id or False
+
+        return result
 
     def action_mark_followup_done(self):
         """Mark follow-up as completed"""
@@ -549,14 +1108,14 @@ class VoicenterCallLog(models.Model):
             }
 
     def action_open_recording(self):
-        """Open call recording URL"""
+        """Play the call recording, served from the local recording cache"""
         self.ensure_one()
         if not self.record_url:
             raise UserError(_("No recording URL available for this call"))
 
         return {
             'type': 'ir.actions.act_url',
-            'url': self.record_url,
+            'url': f'/voicenter/recording/{self.id}',
             'target': 'new',
         }
 
@@ -619,27 +1178,98 @@ class VoicenterCallLog(models.Model):
         is_business_hours = business_start <= current_hour < business_end
 
         # Get last sync time
-        last_call = self.search([], order='synced_at desc', limit=1)
-        last_sync = last_call.synced_at if last_call else datetime.now() - \
+        api_token = ICPSudo.get_param('voicenter.api_token')
+        sync_state = api_token and self.env['voicenter.sync.state'].sudo()._get_for_token(api_token)
+        last_sync = sync_state and sync_state.last_sync_at or datetime.now() - \
             timedelta(hours=24)
 
         minutes_since_sync = (datetime.now() - last_sync).total_seconds() / 60
 
         # Determine if we should sync
-        should_sync = False
-        if is_business_hours:
-            if minutes_since_sync >= peak_interval:
-                should_sync = True
-                hours_back = (peak_interval / 60) + 0.5  # Add buffer
-        else:
-            if minutes_since_sync >= off_peak_interval:
-                should_sync = True
-                hours_back = (off_peak_interval / 60) + 0.5  # Add buffer
+        interval = peak_interval if is_business_hours else off_peak_interval
+        hours_back = (interval / 60) + 0.5  # Add buffer
+        should_sync = minutes_since_sync >= interval
+
+        # Calls missed during an outage are caught up regardless of the interval
+        catching_up = bool(sync_state and sync_state.watermark
+                           and sync_state.watermark < datetime.now() - timedelta(hours=hours_back))
 
-        if should_sync:
+        if should_sync or catching_up:
             _logger.info(
-                f"Running {'business hours' if is_business_hours else 'off-peak'} sync")
-            self.sync_from_voicenter(hours_back=hours_back)
+                f"Running {'catch-up' if catching_up else 'business hours' if is_business_hours else 'off-peak'} sync")
+            self._run_scheduled_sync(sync_state, hours_back)
         else:
             _logger.debug(
                 f"Skipping sync - only {minutes_since_sync:.1f} minutes since last sync")
+
+    @api.model
+    def _run_scheduled_sync(self, sync_state, hours_back):
+        """
+        Sync from the watermark up to now in bounded chunks
+
+        After an outage the missed range is split into chunks sized from
+        the call volume and throughput of recent syncs, and synced oldest
+        first until it is caught up or the time budget is spent; the cron
+        is then triggered again to continue. A sync already running on
+        another worker makes this run hand over to the next one as well.
+
+        Args:
+            sync_state: voicenter.sync.state of the configured token
+            hours_back: range synced when there is no watermark yet
+        """
+        now = datetime.now()
+        if not sync_state or not sync_state.watermark:
+            if not self.sync_from_voicenter(hours_back=hours_back, raise_if_locked=False):
+                self._trigger_smart_sync(delay_minutes=1)
+            return
+
+        max_catchup_hours = self._get_int_param('voicenter.max_catchup_hours', 72)
+        max_chunk_hours = self._get_int_param('voicenter.catchup_chunk_hours', 6)
+
+        start = sync_state.watermark
+        catchup_limit = now - timedelta(hours=max_catchup_hours)
+        if start < catchup_limit:
+            _logger.warning(
+                f"Voicenter sync is {(now - start).total_seconds() / 3600:.0f} hours behind; catching up the last "
+                f"{max_catchup_hours} hours only, use a historical backfill for older calls")
+            start = catchup_limit
+            # The skipped calls are left to the backfill; the chunks below must
+            # be contiguous with the watermark to advance it
+            sync_state._skip_watermark(start)
+
+        chunk = timedelta(hours=self.env['voicenter.sync.run'].sudo()._get_catchup_chunk_hours(max_chunk_hours))
+        overlap = timedelta(minutes=sync_state.overlap_minutes)
+        deadline = time.monotonic() + CATCHUP_TIME_BUDGET
+
+        while start < now:
+            end = min(start + chunk, now)
+            if end < now:
+                _logger.info(f"Catching up Voicenter calls up to {end:%Y-%m-%dT%H:%M:%S}")
+            synced = self.sync_from_voicenter(
+                hours_back=(end - start + overlap).total_seconds() / 3600,
+                to_date=end, raise_if_locked=False)
+            if not synced:
+                self._trigger_smart_sync(delay_minutes=1)
+                return
+            start = end
+            if start < now and time.monotonic() > deadline:
+                _logger.info("Voicenter catch-up paused, continuing in the next run")
+                self._trigger_smart_sync()
+                return
+
+    @api.model
+    def _get_int_param(self, key, default):
+        """Positive integer system parameter, default when unset or invalid"""
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        try:
+            value = int(ICPSudo.get_param(key, default))
+        except (TypeError, ValueError):
+            value = default
+        return max(value, 1)
+
+    @api.model
+    def _trigger_smart_sync(self, delay_minutes=0):
+        """Schedule the smart sync cron to run again"""
+        cron = self.env.ref('hamarpea_odoo_voicenter.ir_cron_voicenter_smart_sync', raise_if_not_found=False)
+        if cron:
+            cron._trigger(fields.Datetime.now() + timedelta(minutes=delay_minutes))
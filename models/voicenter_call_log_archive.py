@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.tools import SQL
+from datetime import datetime, timedelta
+import logging
+
+from .voicenter_call_log import FOLLOWUP_WINDOW_DAYS
+
+_logger = logging.getLogger(__name__)
+
+# Columns copied from voicenter_call_log when a call is archived
+ARCHIVED_FIELDS = [
+    'call_id', 'date', 'caller_number', 'target_number', 'caller_extension',
+    'target_extension', 'did', 'duration', 'ring_time', 'call_type', 'cdr_type',
+    'dial_status', 'record_url', 'representative_id', 'department_id', 'queue_id',
+    'price', 'destination_id', 'dtmf_data', 'custom_data', 'partner_id', 'lead_id',
+    'is_incoming', 'is_outgoing', 'is_answered', 'is_missed',
+]
+
+
+class VoicenterCallLogArchive(models.Model):
+    _name = 'voicenter.call.log.archive'
+    _description = 'Archived Voicenter Call Log'
+    _order = 'date desc'
+    _rec_name = 'call_id'
+
+    call_id = fields.Char('Call ID', required=True, readonly=True)
+    date = fields.Datetime('Call Date', required=True, index=True, readonly=True)
+
+    caller_number = fields.Char('Caller Number', readonly=True)
+    target_number = fields.Char('Target Number', readonly=True)
+    caller_extension = fields.Char('Caller Extension', readonly=True)
+    target_extension = fields.Char('Target Extension', readonly=True)
+    did = fields.Char('DID Number', readonly=True)
+
+    duration = fields.Integer('Duration (seconds)', readonly=True)
+    ring_time = fields.Integer('Ring Time (seconds)', readonly=True)
+    call_type = fields.Char('Call Type', readonly=True)
+    cdr_type = fields.Integer('CDR Type ID', readonly=True)
+    dial_status = fields.Char('Dial Status', readonly=True)
+    record_url = fields.Char('Recording URL', readonly=True)
+
+    representative_id = fields.Many2one('voicenter.representative', string='Representative',
+                                        ondelete='restrict', readonly=True)
+    representative_name = fields.Char(related='representative_id.name', string='Representative Name')
+    representative_code = fields.Char(related='representative_id.code', string='Representative Code')
+    user_name = fields.Char(related='representative_id.user_name', string='User Name')
+    department_id = fields.Many2one('voicenter.department', string='Department',
+                                    ondelete='restrict', readonly=True)
+    department_name = fields.Char(related='department_id.name', string='Department Name')
+    department_id_ext = fields.Integer(related='department_id.external_id', string='Department ID (External)')
+    queue_id = fields.Many2one('voicenter.queue', string='Queue', ondelete='restrict', readonly=True)
+    queue_name = fields.Char(related='queue_id.name', string='Queue Name')
+    price = fields.Float('Price (Agorot)', digits=(16, 2), readonly=True)
+    destination_id = fields.Many2one('voicenter.destination', string='Destination',
+                                     ondelete='restrict', readonly=True)
+    target_prefix_name = fields.Char(related='destination_id.name', string='Destination Country')
+    dtmf_data = fields.Text('DTMF Data (JSON)', readonly=True)
+    custom_data = fields.Text('Custom Data (JSON)', readonly=True)
+
+    partner_id = fields.Many2one('res.partner', string='Contact', index=True,
+                                 ondelete='set null', readonly=True)
+    lead_id = fields.Many2one('crm.lead', string='Lead/Opportunity', index=True,
+                              ondelete='set null', readonly=True)
+
+    # Classification is frozen at archive time, no recompute needed
+    is_incoming = fields.Boolean('Incoming Call', readonly=True)
+    is_outgoing = fields.Boolean('Outgoing Call', readonly=True)
+    is_answered = fields.Boolean('Answered', readonly=True)
+    is_missed = fields.Boolean('Missed/Unanswered', readonly=True)
+
+    archived_at = fields.Datetime('Archived At', readonly=True)
+
+    _sql_constraints = [
+        ('call_id_unique', 'UNIQUE(call_id)', 'Call ID must be unique!')
+    ]
+
+    @api.model
+    def _get_retention_days(self):
+        """
+        Days calls stay in the live call log; 0 disables archiving
+
+        Calls stay live at least as long as the follow-up scan looks back.
+        """
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        try:
+            retention_days = int(ICPSudo.get_param('voicenter.hot_retention_days', 0))
+        except (TypeError, ValueError):
+            return 0
+        return max(retention_days, FOLLOWUP_WINDOW_DAYS) if retention_days > 0 else 0
+
+    @api.model
+    def _cron_archive_old_calls(self):
+        """
+        Move calls older than the retention window to the archive
+
+        Calls are copied with a single INSERT ... SELECT per chunk and then
+        removed from the live table through the ORM, so their chatter and
+        activities are cleaned up too. Each chunk is committed.
+        """
+        retention_days = self._get_retention_days()
+        if not retention_days:
+            return
+
+        CallLog = self.env['voicenter.call.log']
+        cutoff = datetime.now() - timedelta(days=retention_days)
+        chunk_size = CallLog._get_sync_batch_size()
+        columns = SQL(', ').join(SQL.identifier(name) for name in ARCHIVED_FIELDS)
+        archived_count = 0
+
+        while True:
+            calls = CallLog.search([('date', '<', cutoff)], order='date', limit=chunk_size)
+            if not calls:
+                break
+
+            CallLog.flush_model(ARCHIVED_FIELDS)
+            self.env.cr.execute(SQL("""
+                INSERT INTO voicenter_call_log_archive (
+                    %(columns)s, archived_at, create_uid, create_date, write_uid, write_date
+                )
+                SELECT %(columns)s, %(now)s, %(uid)s, %(now)s, %(uid)s, %(now)s
+                  FROM voicenter_call_log
+                 WHERE id = ANY(%(ids)s)
+                ON CONFLICT (call_id) DO NOTHING
+            """, columns=columns, now=fields.Datetime.now(), uid=self.env.uid, ids=calls.ids))
+
+            calls.with_context(voicenter_archiving=True).unlink()
+            archived_count += len(calls)
+            CallLog._commit_sync_progress()
+
+        if archived_count:
+            _logger.info(f"Archived {archived_count} Voicenter calls older than {retention_days} days")
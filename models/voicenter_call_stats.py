@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.tools import SQL
+from datetime import timedelta
+import logging
+
+from psycopg2.errors import SerializationFailure
+
+from .voicenter_call_log import STATS_SOURCE_FIELDS
+
+_logger = logging.getLogger(__name__)
+
+# Hours rebuilt per transaction by the refresh cron
+REFRESH_BATCH_SIZE = 200
+# Attempts at queueing hours when concurrent transactions queue the same ones
+QUEUE_ATTEMPTS = 3
+# Key of the hours collected for queueing in the cursor's postcommit data
+DIRTY_HOURS_KEY = 'voicenter.call.stats.dirty_hours'
+
+
+class VoicenterCallStatsPending(models.Model):
+    _name = 'voicenter.call.stats.pending'
+    _description = 'Voicenter Call Statistics Refresh Queue'
+    _log_access = False
+
+    hour_start = fields.Datetime('Hour', required=True)
+
+    _sql_constraints = [
+        ('hour_start_unique', 'UNIQUE(hour_start)', 'This hour is already queued!')
+    ]
+
+
+class VoicenterCallStats(models.Model):
+    _name = 'voicenter.call.stats'
+    _description = 'Voicenter Call Statistics'
+    _order = 'hour_start desc'
+    _log_access = False
+
+    hour_start = fields.Datetime('Hour', required=True, index=True, readonly=True)
+    representative_id = fields.Many2one('voicenter.representative', string='Representative', readonly=True)
+    department_id = fields.Many2one('voicenter.department', string='Department', readonly=True)
+    queue_id = fields.Many2one('voicenter.queue', string='Queue', readonly=True)
+    direction = fields.Selection([
+        ('incoming', 'Incoming'),
+        ('outgoing', 'Outgoing'),
+        ('other', 'Other'),
+    ], string='Direction', readonly=True)
+    dial_status = fields.Char('Dial Status', readonly=True)
+
+    call_count = fields.Integer('Calls', readonly=True)
+    answered_count = fields.Integer('Answered', readonly=True)
+    missed_count = fields.Integer('Missed', readonly=True)
+    total_duration = fields.Integer('Duration (seconds)', readonly=True)
+    total_ring_time = fields.Integer('Ring Time (seconds)', readonly=True)
+    total_price = fields.Float('Price (Agorot)', digits=(16, 2), readonly=True)
+
+    def init(self):
+        """Queue every hour with calls for the first build of the rollup"""
+        self.env.cr.execute(SQL("SELECT 1 FROM voicenter_call_stats LIMIT 1"))
+        if self.env.cr.fetchone():
+            return
+        self.env.cr.execute(SQL("""
+            INSERT INTO voicenter_call_stats_pending (hour_start)
+            SELECT DISTINCT date_trunc('hour', date) FROM voicenter_call_log
+             UNION
+            SELECT DISTINCT date_trunc('hour', date) FROM voicenter_call_log_archive
+            ON CONFLICT (hour_start) DO NOTHING
+        """))
+
+    @api.model
+    def _mark_hours_dirty(self, dates):
+        """
+        Queue the hours of the given call dates for a rollup refresh
+
+        Hours are only collected here. They are queued once the transaction
+        commits, from their own transaction, so a conflict on the queue can
+        never fail the ingest that changed the calls.
+
+        Args:
+            dates: iterable of call datetimes
+        """
+        hours = {date.replace(minute=0, second=0, microsecond=0) for date in dates if date}
+        if not hours:
+            return
+        postcommit = self.env.cr.postcommit
+        dirty_hours = postcommit.data.get(DIRTY_HOURS_KEY)
+        if dirty_hours is None:
+            dirty_hours = postcommit.data[DIRTY_HOURS_KEY] = set()
+            postcommit.add(lambda: self._queue_hours(dirty_hours))
+        dirty_hours.update(hours)
+
+    @api.model
+    def _queue_hours(self, hours):
+        """
+        Add hours to the refresh queue and trigger the refresh cron once
+
+        Runs after commit in a new cursor; concurrent queueing of the same
+        hours is retried, and any other failure is only logged.
+
+        Args:
+            hours: set of hour start datetimes
+        """
+        for _attempt in range(QUEUE_ATTEMPTS):
+            try:
+                with self.env.registry.cursor() as cr:
+                    cr.execute(SQL("""
+                        INSERT INTO voicenter_call_stats_pending (hour_start)
+                        SELECT unnest(%s::timestamp[])
+                        ON CONFLICT (hour_start) DO NOTHING
+                    """, sorted(hours)))
+                    cron = self.env(cr=cr).ref(
+                        'hamarpea_odoo_voicenter.ir_cron_voicenter_refresh_call_stats',
+                        raise_if_not_found=False)
+                    if cron:
+                        cron._trigger()
+                return
+            except SerializationFailure:
+                continue
+            except Exception as e:
+                _logger.warning(f"Could not queue {len(hours)} hours for a call statistics refresh: {e}")
+                return
+        _logger.warning(f"Could not queue {len(hours)} hours for a call statistics refresh: "
+                        f"concurrent updates")
+
+    @api.model
+    def _refresh_hours(self, hours):
+        """
+        Rebuild the rollup rows of some hours from live and archived calls
+
+        Args:
+            hours: list of hour start datetimes
+        """
+        self.env['voicenter.call.log'].flush_model(STATS_SOURCE_FIELDS)
+        self.env.cr.execute(SQL("DELETE FROM voicenter_call_stats WHERE hour_start = ANY(%s)", hours))
+
+        columns = SQL(', ').join(SQL.identifier(name) for name in sorted(STATS_SOURCE_FIELDS))
+        calls_filter = SQL(
+            "date >= %(first)s AND date < %(last)s AND date_trunc('hour', date) = ANY(%(hours)s)",
+            first=min(hours), last=max(hours) + timedelta(hours=1), hours=hours)
+        self.env.cr.execute(SQL("""
+            INSERT INTO voicenter_call_stats (
+                hour_start, representative_id, department_id, queue_id, direction, dial_status,
+                call_count, answered_count, missed_count, total_duration, total_ring_time, total_price
+            )
+            SELECT date_trunc('hour', date), representative_id, department_id, queue_id,
+                   CASE WHEN is_incoming THEN 'incoming' WHEN is_outgoing THEN 'outgoing' ELSE 'other' END,
+                   dial_status,
+                   count(*),
+                   count(*) FILTER (WHERE is_answered),
+                   count(*) FILTER (WHERE is_missed),
+                   coalesce(sum(duration), 0),
+                   coalesce(sum(ring_time), 0),
+                   coalesce(sum(price), 0)
+              FROM (
+                    SELECT %(columns)s FROM voicenter_call_log WHERE %(calls_filter)s
+                    UNION ALL
+                    SELECT %(columns)s FROM voicenter_call_log_archive WHERE %(calls_filter)s
+                   ) AS calls
+          GROUP BY 1, 2, 3, 4, 5, 6
+        """, columns=columns, calls_filter=calls_filter))
+        self.invalidate_model()
+
+    @api.model
+    def _cron_refresh_stats(self):
+        """
+        Rebuild the rollup for the hours whose calls changed
+
+        Hours are claimed by removing them from the pending queue (SKIP
+        LOCKED), then rebuilt, one committed batch at a time. An hour queued
+        again while it is rebuilt gets a fresh queue row and is rebuilt by
+        a later batch.
+        """
+        CallLog = self.env['voicenter.call.log']
+        refreshed = 0
+        while True:
+            self.env.cr.execute(SQL("""
+                DELETE FROM voicenter_call_stats_pending
+                 WHERE hour_start IN (
+                        SELECT hour_start FROM voicenter_call_stats_pending
+                      ORDER BY hour_start
+                         LIMIT %s
+                           FOR UPDATE SKIP LOCKED
+                       )
+             RETURNING hour_start
+            """, REFRESH_BATCH_SIZE))
+            hours = [row[0] for row in self.env.cr.fetchall()]
+            if not hours:
+                break
+
+            self._refresh_hours(sorted(hours))
+            refreshed += len(hours)
+            CallLog._commit_sync_progress()
+
+        if refreshed:
+            _logger.info(f"Refreshed Voicenter call statistics for {refreshed} hours")
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+import json
+import logging
+
+from .voicenter_sync_state import LIVE_SYNC_LOCK_WAIT
+
+_logger = logging.getLogger(__name__)
+
+
+class VoicenterCdrDeadLetter(models.Model):
+    _name = 'voicenter.cdr.dead.letter'
+    _description = 'Voicenter CDR Dead Letter'
+    _order = 'id desc'
+    _rec_name = 'call_id'
+
+    call_id = fields.Char('Call ID', index=True)
+    payload = fields.Text('CDR (JSON)')
+    error = fields.Text('Error')
+    failed_at = fields.Datetime('Failed At', default=fields.Datetime.now)
+    attempts = fields.Integer('Attempts', default=1)
+
+    @api.model
+    def _record(self, cdr, error):
+        """Store a CDR that could not be ingested, with the error it raised"""
+        call_id = cdr.get('CallID') if isinstance(cdr, dict) else False
+        existing = call_id and self.search([('call_id', '=', str(call_id))], limit=1)
+        if existing:
+            existing.write({
+                'error': error,
+                'failed_at': fields.Datetime.now(),
+                'attempts': existing.attempts + 1,
+            })
+            return existing
+
+        return self.create({
+            'call_id': call_id and str(call_id),
+            'payload': json.dumps(cdr, ensure_ascii=False, default=str),
+            'error': error,
+        })
+
+    @api.model
+    def _clear_ingested(self, call_ids):
+        """
+        Remove the dead letters of calls that were ingested successfully
+
+        Args:
+            call_ids: Voicenter call IDs of the ingested CDRs
+        """
+        self.search([('call_id', 'in', list(call_ids))]).unlink()
+
+    def action_retry(self):
+        """Ingest the stored CDRs again; the ones that succeed are removed
+
+        CDRs without a call ID can never be stored and are left as they are.
+        The CDRs are ingested under the account's sync lock, like any sync,
+        and the calls ingested go through follow-up detection.
+
+        Returns:
+            notification action with the number of CDRs that succeeded
+            and failed
+        """
+        cdrs = []
+        for dead_letter in self.filtered('call_id'):
+            try:
+                cdrs.append(json.loads(dead_letter.payload))
+            except (TypeError, ValueError):
+                continue
+
+        if cdrs:
+            ICPSudo = self.env['ir.config_parameter'].sudo()
+            api_token = ICPSudo.get_param('voicenter.api_token')
+            if not api_token:
+                self._retry_cdrs(cdrs)
+            else:
+                sync_state = self.env['voicenter.sync.state'].sudo()._get_for_token(api_token)
+                with sync_state._sync_lock(wait=LIVE_SYNC_LOCK_WAIT) as acquired:
+                    if not acquired:
+                        raise UserError(_("A Voicenter sync is running. Please retry these calls in a few minutes."))
+                    # Start from a fresh snapshot, so calls written by the previous holder are seen
+                    self.env['voicenter.call.log']._commit_sync_progress()
+                    self.env.invalidate_all()
+                    self._retry_cdrs(cdrs)
+                    # Committed before the lock is released
+                    self.env['voicenter.call.log']._commit_sync_progress()
+
+        # Ingested CDRs removed their own dead letter
+        failed_count = len(self.exists())
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Voicenter Dead Letters'),
+                'message': _('%(succeeded)s CDRs ingested, %(failed)s still failing',
+                             succeeded=len(self) - failed_count, failed=failed_count),
+                'type': 'warning' if failed_count else 'success',
+                'sticky': False,
+            }
+        }
+
+    @api.model
+    def _retry_cdrs(self, cdrs):
+        """Ingest CDRs again and detect follow-ups among the ingested calls"""
+        CallLog = self.env['voicenter.call.log']
+        stats = CallLog._ingest_cdrs(cdrs)
+        CallLog._identify_unclosed_calls(CallLog.browse(stats['call_ids']))
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.tools import SQL
+from datetime import timedelta
+import json
+import logging
+
+from .voicenter_sync_state import LIVE_SYNC_LOCK_WAIT
+
+_logger = logging.getLogger(__name__)
+
+# Delay before processing the queue again when another worker is ingesting
+LOCKED_RETRY_MINUTES = 1
+
+
+class VoicenterCdrQueue(models.Model):
+    _name = 'voicenter.cdr.queue'
+    _description = 'Voicenter CDR Queue'
+    _order = 'id'
+    _rec_name = 'call_id'
+
+    call_id = fields.Char('Call ID', index=True)
+    payload = fields.Text('CDR (JSON)', required=True)
+    received_at = fields.Datetime('Received At', default=fields.Datetime.now)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('failed', 'Failed'),
+    ], string='State', default='pending', required=True, index=True)
+    error = fields.Text('Error')
+
+    @api.model
+    def _enqueue(self, cdr_list):
+        """Queue pushed CDRs and wake up the queue cron"""
+        self.create([{
+            'call_id': cdr.get('CallID'),
+            'payload': json.dumps(cdr, ensure_ascii=False),
+        } for cdr in cdr_list])
+
+        cron = self.env.ref('hamarpea_odoo_voicenter.ir_cron_voicenter_process_queue',
+                            raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+    @api.model
+    def _cron_process_queue(self):
+        """
+        Ingest queued CDRs in micro-batches
+
+        Each batch is locked with SKIP LOCKED so concurrent runs never pick
+        the same entries, ingested through the regular sync pipeline,
+        removed from the queue and committed. A failing batch is kept
+        with its error and the next one is processed.
+
+        Batches are ingested under the account's sync lock; when another
+        worker holds it for longer than LIVE_SYNC_LOCK_WAIT, the run is
+        postponed.
+        """
+        CallLog = self.env['voicenter.call.log']
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        api_token = ICPSudo.get_param('voicenter.api_token')
+        if not api_token:
+            self._process_queue_batches()
+            return
+
+        sync_state = self.env['voicenter.sync.state'].sudo()._get_for_token(api_token)
+        with sync_state._sync_lock(wait=LIVE_SYNC_LOCK_WAIT) as acquired:
+            if not acquired:
+                self.env.ref('hamarpea_odoo_voicenter.ir_cron_voicenter_process_queue')._trigger(
+                    fields.Datetime.now() + timedelta(minutes=LOCKED_RETRY_MINUTES))
+                return
+            # Start from a fresh snapshot, so calls written by the previous holder are seen
+            CallLog._commit_sync_progress()
+            self.env.invalidate_all()
+            self._process_queue_batches()
+
+    @api.model
+    def _process_queue_batches(self):
+        """Ingest pending queue entries batch by batch, committing each one"""
+        CallLog = self.env['voicenter.call.log']
+        batch_size = CallLog._get_sync_batch_size()
+
+        while True:
+            self.env.cr.execute(SQL("""
+                SELECT id FROM voicenter_cdr_queue
+                 WHERE state = 'pending'
+              ORDER BY id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+            """, batch_size))
+            entries = self.browse([row[0] for row in self.env.cr.fetchall()])
+            if not entries:
+                break
+
+            try:
+                with self.env.cr.savepoint():
+                    stats = CallLog._ingest_cdrs([json.loads(entry.payload) for entry in entries])
+                    CallLog._identify_unclosed_calls(CallLog.browse(stats['call_ids']))
+                    entries.unlink()
+                _logger.info(
+                    f"Voicenter queue: {stats['created']} created, {stats['updated']} updated, "
+                    f"{stats['skipped']} unchanged, {stats['failed']} failed")
+            except Exception as e:
+                _logger.exception("Failed to ingest queued Voicenter CDRs")
+                entries.write({'state': 'failed', 'error': str(e)})
+
+            CallLog._commit_sync_progress()
+
+    def action_retry(self):
+        """Put failed entries back in the queue"""
+        self.write({'state': 'pending', 'error': False})
+        self.env.ref('hamarpea_odoo_voicenter.ir_cron_voicenter_process_queue')._trigger()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api, tools
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class VoicenterDimensionMixin(models.AbstractModel):
+    """
+    Small lookup table of a call dimension
+
+    Calls reference dimension rows by id instead of repeating their
+    strings. Rows are resolved at ingest through a cached map of their
+    key (_dimension_key) to their id, and created on first sight. The
+    cached map only holds committed rows: a row created by a transaction
+    that still rolls back must never be referenced by another one.
+    """
+    _name = 'voicenter.dimension.mixin'
+    _description = 'Voicenter Call Dimension'
+    _dimension_key = 'name'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        # The new rows enter the cached map once they are committed
+        self.env.cr.postcommit.add(self.env.registry.clear_cache)
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        # Other edits, such as mapping a representative to a user, keep the map
+        if self._dimension_key in vals:
+            self.env.cr.postcommit.add(self.env.registry.clear_cache)
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.cr.postcommit.add(self.env.registry.clear_cache)
+        return result
+
+    @api.model
+    @tools.ormcache()
+    def _get_dimension_id_map(self):
+        """Map the key of every row committed before this transaction to its id"""
+        records = self.sudo().search_fetch(
+            [('create_date', '<', self.env.cr.now())], [self._dimension_key])
+        return {record[self._dimension_key]: record.id for record in records}
+
+    @api.model
+    def _resolve_dimension_ids(self, values_by_key):
+        """
+        Resolve dimension keys to ids, creating rows for unknown keys
+
+        Args:
+            values_by_key: dict mapping key to the other values of its row,
+                used when the row has to be created
+
+        Returns:
+            dict mapping key to id
+        """
+        id_map = self._get_dimension_id_map()
+        unknown = {key: vals for key, vals in values_by_key.items() if key not in id_map}
+        if not unknown:
+            return {key: id_map[key] for key in values_by_key}
+
+        # Rows created since the map was cached, by another worker or by this
+        # transaction, are not recreated; their ids are used without caching them
+        id_map = dict(id_map)
+        known = self.sudo().search_fetch(
+            [(self._dimension_key, 'in', list(unknown))], [self._dimension_key])
+        id_map.update((record[self._dimension_key], record.id) for record in known)
+        missing = {key: vals for key, vals in unknown.items() if key not in id_map}
+        if missing:
+            created = self._create_dimensions(missing)
+            id_map.update((record[self._dimension_key], record.id) for record in created)
+        else:
+            self.env.cr.postcommit.add(self.env.registry.clear_cache)
+        return {key: id_map[key] for key in values_by_key}
+
+    @api.model
+    def _create_dimensions(self, values_by_key):
+        """
+        Create the rows of new dimension keys
+
+        Args:
+            values_by_key: dict mapping key to the other values of its row
+
+        Returns:
+            the created records
+        """
+        records = self.sudo().create([
+            dict(vals, **{self._dimension_key: key}) for key, vals in values_by_key.items()
+        ])
+        _logger.info(f"Registered {len(values_by_key)} new {self._description} rows")
+        return records
+
+
+class VoicenterDepartment(models.Model):
+    _name = 'voicenter.department'
+    _description = 'Voicenter Department'
+    _inherit = ['voicenter.dimension.mixin']
+    _order = 'name'
+
+    name = fields.Char('Department Name', required=True)
+    external_id = fields.Integer('Department ID (External)',
+                                 help='DepartmentId reported by Voicenter')
+
+    _sql_constraints = [
+        ('name_unique', 'UNIQUE(name)', 'Department name must be unique!')
+    ]
+
+
+class VoicenterQueue(models.Model):
+    _name = 'voicenter.queue'
+    _description = 'Voicenter Queue'
+    _inherit = ['voicenter.dimension.mixin']
+    _order = 'name'
+
+    name = fields.Char('Queue Name', required=True)
+
+    _sql_constraints = [
+        ('name_unique', 'UNIQUE(name)', 'Queue name must be unique!')
+    ]
+
+
+class VoicenterDestination(models.Model):
+    _name = 'voicenter.destination'
+    _description = 'Voicenter Destination'
+    _inherit = ['voicenter.dimension.mixin']
+    _order = 'name'
+
+    name = fields.Char('Destination Country', required=True,
+                       help='TargetPrefixName reported by Voicenter')
+
+    _sql_constraints = [
+        ('name_unique', 'UNIQUE(name)', 'Destination name must be unique!')
+    ]
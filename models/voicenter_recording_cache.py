@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.tools import config
+from datetime import timedelta, timezone
+import logging
+import os
+import time
+
+import requests
+
+from ..tools.recording_cache import RecordingCache
+
+_logger = logging.getLogger(__name__)
+
+# Seconds a prefetch run may spend downloading
+PREFETCH_TIME_BUDGET = 600
+# Share of the cache size prefetching may fill; the headroom absorbs the last
+# download of a run, so prefetched recordings are never evicted to make room
+# for other prefetched ones
+PREFETCH_FILL_RATIO = 0.9
+
+
+class VoicenterRecordingCache(models.AbstractModel):
+    _name = 'voicenter.recording.cache'
+    _description = 'Voicenter Recording Cache'
+
+    @api.model
+    def _get_cache(self):
+        """
+        Return the recording cache of the current database
+
+        Returns:
+            RecordingCache, or None when caching is disabled
+        """
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        try:
+            max_mb = int(ICPSudo.get_param('voicenter.recording_cache_mb', 2048))
+        except (TypeError, ValueError):
+            max_mb = 2048
+        if max_mb <= 0:
+            return None
+        root = os.path.join(config.filestore(self.env.cr.dbname), 'voicenter_recordings')
+        return RecordingCache(root, max_mb * 1024 * 1024)
+
+    @api.model
+    def _get_recording_path(self, call):
+        """
+        Path of the recording of a call, downloading it on first use
+
+        The cache is brought back to its size limit by the prefetch cron,
+        not on every download.
+
+        Args:
+            call: voicenter.call.log record with a record_url
+
+        Returns:
+            path of the cached recording, or None when caching is disabled
+            or the download failed
+        """
+        cache = self._get_cache()
+        if cache is None:
+            return None
+        path = cache.get(call.call_id)
+        if path:
+            return path
+        try:
+            path = cache.fetch(call.call_id, call.record_url)
+        except (requests.exceptions.RequestException, OSError) as e:
+            _logger.warning(f"Could not download recording of Voicenter call {call.call_id}: {e}")
+            return None
+        return path
+
+    @api.model
+    def _cron_prefetch_recordings(self):
+        """
+        Evict least recently used recordings, then download the recordings
+        of recent calls that are not cached yet
+
+        Prefetched recordings count as last used at the time of their call,
+        so the oldest unplayed ones are evicted first when the cache is full.
+        Prefetching goes from the newest call back and stops once the free
+        capacity is used up, so it never downloads what eviction would
+        remove again.
+        """
+        cache = self._get_cache()
+        if cache is None:
+            return
+        cache.evict()
+
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        try:
+            prefetch_days = int(ICPSudo.get_param('voicenter.recording_prefetch_days', 7))
+        except (TypeError, ValueError):
+            prefetch_days = 7
+        if prefetch_days <= 0:
+            return
+
+        calls = self.env['voicenter.call.log'].sudo().search_fetch([
+            ('record_expect', '=', True),
+            ('record_url', '!=', False),
+            ('date', '>=', fields.Datetime.now() - timedelta(days=prefetch_days)),
+        ], ['call_id', 'record_url', 'date'], order='date desc')
+
+        free_bytes = cache.max_bytes * PREFETCH_FILL_RATIO - cache.size()
+        deadline = time.monotonic() + PREFETCH_TIME_BUDGET
+        fetched = failed = 0
+        for call in calls:
+            if free_bytes <= 0:
+                _logger.info("Recording prefetch stopped: the recording cache is full")
+                break
+            if time.monotonic() > deadline:
+                _logger.info("Recording prefetch paused, continuing in the next run")
+                break
+            if cache.contains(call.call_id):
+                continue
+            try:
+                path = cache.fetch(call.call_id, call.record_url,
+                                   last_used=call.date.replace(tzinfo=timezone.utc).timestamp())
+                free_bytes -= os.path.getsize(path)
+                fetched += 1
+            except (requests.exceptions.RequestException, OSError) as e:
+                _logger.warning(f"Could not download recording of Voicenter call {call.call_id}: {e}")
+                failed += 1
+
+        if fetched or failed:
+            _logger.info(f"Prefetched {fetched} Voicenter recordings, {failed} failed")
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from datetime import timedelta
+from collections import defaultdict
+import logging
+
+from ..tools.voicenter_api import VoicenterApiError
+from .voicenter_call_log import CDR_FIELDS
+from .voicenter_sync_state import LIVE_SYNC_LOCK_WAIT
+
+_logger = logging.getLogger(__name__)
+
+# Re-fetch schedule: RETRY_BASE_MINUTES, doubled after each attempt, at most RETRY_MAX_MINUTES
+RETRY_BASE_MINUTES = 10
+RETRY_MAX_MINUTES = 6 * 60
+# Pending calls closer than this are re-fetched with one API request
+WINDOW_GAP_MINUTES = 15
+# Longest range fetched with one API request
+WINDOW_MAX_MINUTES = 120
+# Margin fetched around each call date
+WINDOW_MARGIN_MINUTES = 2
+# Pending calls re-fetched per cron run
+BATCH_SIZE = 500
+
+
+class VoicenterRecordingPending(models.Model):
+    _name = 'voicenter.recording.pending'
+    _description = 'Voicenter Pending Recording'
+    _order = 'next_attempt_at, id'
+    _rec_name = 'call_log_id'
+
+    call_log_id = fields.Many2one('voicenter.call.log', string='Call', required=True,
+                                  ondelete='cascade', index=True)
+    call_id = fields.Char(related='call_log_id.call_id', string='Call ID')
+    call_date = fields.Datetime(related='call_log_id.date', string='Call Date')
+    attempts = fields.Integer('Attempts', default=0)
+    next_attempt_at = fields.Datetime('Next Attempt', required=True, index=True,
+                                      default=fields.Datetime.now)
+    expires_at = fields.Datetime('Give Up After', required=True)
+
+    _sql_constraints = [
+        ('call_log_unique', 'UNIQUE(call_log_id)', 'This call is already waiting for its recording!')
+    ]
+
+    @api.model
+    def _get_ttl_hours(self):
+        """Hours a recording is waited for after the call"""
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        try:
+            ttl_hours = int(ICPSudo.get_param('voicenter.recording_ttl_hours', 48))
+        except (TypeError, ValueError):
+            ttl_hours = 48
+        return max(ttl_hours, 1)
+
+    @api.model
+    def _enqueue(self, calls):
+        """
+        Wait for the recordings of calls that expect one but have no URL yet
+
+        The wait is measured from the call. Historical calls imported by a
+        backfill or catch-up, whose wait would be over before the first
+        re-fetch, are not queued: their recordings are not coming.
+
+        Args:
+            calls: voicenter.call.log records, filtered here
+        """
+        calls = calls.filtered(lambda c: c.record_expect and not c.record_url)
+        if not calls:
+            return
+        queued_ids = set(self.search_fetch([('call_log_id', 'in', calls.ids)], ['call_log_id']).call_log_id.ids)
+        ttl = timedelta(hours=self._get_ttl_hours())
+        first_attempt = fields.Datetime.now() + timedelta(minutes=RETRY_BASE_MINUTES)
+        self.create([{
+            'call_log_id': call.id,
+            'next_attempt_at': first_attempt,
+            'expires_at': call.date + ttl,
+        } for call in calls if call.id not in queued_ids and call.date + ttl > first_attempt])
+
+    @api.model
+    def _group_windows(self, entries):
+        """
+        Group pending calls into narrow date ranges to re-fetch
+
+        Args:
+            entries: voicenter.recording.pending records
+
+        Returns:
+            list of (from_date, to_date, entries) tuples
+        """
+        margin = timedelta(minutes=WINDOW_MARGIN_MINUTES)
+        windows = []
+        for entry in entries.sorted(lambda e: e.call_log_id.date):
+            date = entry.call_log_id.date
+            if windows:
+                from_date, to_date, window_entries = windows[-1]
+                if (date - margin - to_date <= timedelta(minutes=WINDOW_GAP_MINUTES)
+                        and date + margin - from_date <= timedelta(minutes=WINDOW_MAX_MINUTES)):
+                    windows[-1] = (from_date, max(to_date, date + margin), window_entries | entry)
+                    continue
+            windows.append((date - margin, date + margin, entry))
+        return windows
+
+    @api.model
+    def _cron_refetch_recordings(self):
+        """
+        Re-fetch the CDRs of calls still waiting for their recording URL
+
+        Only the narrow ranges around the pending calls are fetched, and
+        only their CDRs are ingested. Calls that got their URL leave the
+        queue; the others are retried with exponential backoff until their
+        TTL expires. Re-fetched CDRs are ingested under the account's sync
+        lock; while another worker holds it, the run is skipped.
+        """
+        now = fields.Datetime.now()
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        api_token = ICPSudo.get_param('voicenter.api_token')
+        if not api_token:
+            return
+
+        # Recordings that arrived through a regular sync, and recordings given up on
+        done = self.search([('call_log_id.record_url', '!=', False)])
+        expired = self.search([('expires_at', '<', now), ('id', 'not in', done.ids)])
+        if expired:
+            _logger.info(f"Gave up waiting for {len(expired)} Voicenter recordings")
+        (done | expired).unlink()
+
+        if not self.search_count([('next_attempt_at', '<=', now)], limit=1):
+            return
+
+        CallLog = self.env['voicenter.call.log']
+        sync_state = self.env['voicenter.sync.state'].sudo()._get_for_token(api_token)
+        with sync_state._sync_lock(wait=LIVE_SYNC_LOCK_WAIT) as acquired:
+            if not acquired:
+                _logger.info("Recording re-fetch skipped: another Voicenter sync is running")
+                return
+            # Start from a fresh snapshot, so calls written by the previous holder are seen
+            CallLog._commit_sync_progress()
+            self.env.invalidate_all()
+            self._refetch_due(api_token, now)
+
+    @api.model
+    def _refetch_due(self, api_token, now):
+        """
+        Re-fetch the pending calls due for an attempt, see _cron_refetch_recordings()
+
+        Args:
+            api_token: Voicenter API token
+            now: time of the cron run
+        """
+        entries = self.search([('next_attempt_at', '<=', now)], limit=BATCH_SIZE)
+        if not entries:
+            return
+
+        CallLog = self.env['voicenter.call.log']
+        client = CallLog._get_voicenter_client(api_token)
+        for from_date, to_date, window_entries in self._group_windows(entries):
+            pending_call_ids = set(window_entries.call_log_id.mapped('call_id'))
+            try:
+                cdr_list = client.fetch_cdrs(from_date, to_date, CDR_FIELDS)
+            except VoicenterApiError as e:
+                _logger.warning(f"Could not re-fetch Voicenter recordings: {e}")
+                break
+            CallLog._ingest_cdrs([cdr for cdr in cdr_list if str(cdr.get('CallID')) in pending_call_ids])
+
+            arrived = window_entries.filtered(lambda e: e.call_log_id.record_url)
+            arrived.unlink()
+
+            # Entries with the same number of attempts share their next attempt
+            waiting_by_attempts = defaultdict(lambda: self.browse())
+            for entry in window_entries - arrived:
+                waiting_by_attempts[entry.attempts] |= entry
+            for attempts, waiting in waiting_by_attempts.items():
+                delay = min(RETRY_BASE_MINUTES * 2 ** (attempts + 1), RETRY_MAX_MINUTES)
+                waiting.write({
+                    'attempts': attempts + 1,
+                    'next_attempt_at': now + timedelta(minutes=delay),
+                })
+            if arrived:
+                _logger.info(f"Found {len(arrived)} late Voicenter recordings")
+            CallLog._commit_sync_progress()
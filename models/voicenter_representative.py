@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class VoicenterRepresentative(models.Model):
+    _name = 'voicenter.representative'
+    _description = 'Voicenter Representative'
+    _inherit = ['voicenter.dimension.mixin']
+    _order = 'name'
+    _dimension_key = 'code'
+
+    code = fields.Char('Representative Code', required=True, index=True,
+                       help='RepresentativeCode reported by Voicenter')
+    name = fields.Char('Representative Name')
+    user_name = fields.Char('Voicenter User Name')
+    user_id = fields.Many2one('res.users', string='Odoo User', ondelete='set null',
+                              help='User assigned to follow-ups of calls handled by this representative')
+
+    _sql_constraints = [
+        ('code_unique', 'UNIQUE(code)', 'Representative code must be unique!')
+    ]
+
+    @api.model
+    def _create_dimensions(self, values_by_key):
+        """
+        Create mapping rows for new representatives
+
+        Each one is matched to a user whose login equals the Voicenter
+        user name, else to the only user with the same name. Ambiguous
+        names are left unassigned for an administrator to map.
+
+        Args:
+            values_by_key: dict mapping code to {'name', 'user_name'} values
+
+        Returns:
+            the created records
+        """
+        names = {vals['name'] for vals in values_by_key.values() if vals.get('name')}
+        logins = {vals['user_name'] for vals in values_by_key.values() if vals.get('user_name')}
+        users = self.env['res.users'].sudo().search([
+            '|', ('name', 'in', list(names)), ('login', 'in', list(logins))
+        ])
+
+        user_id_by_login = {user.login: user.id for user in users}
+        user_ids_by_name = {}
+        for user in users:
+            user_ids_by_name.setdefault(user.name, []).append(user.id)
+
+        vals_list = []
+        for code, vals in values_by_key.items():
+            name, user_name = vals.get('name'), vals.get('user_name')
+            user_id = user_id_by_login.get(user_name)
+            if not user_id and len(user_ids_by_name.get(name, [])) == 1:
+                user_id = user_ids_by_name[name][0]
+            vals_list.append({
+                'code': code,
+                'name': name,
+                'user_name': user_name,
+                'user_id': user_id or False,
+            })
+
+        records = self.sudo().create(vals_list)
+        _logger.info(f"Registered {len(vals_list)} new Voicenter representatives")
+        return records
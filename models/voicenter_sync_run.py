@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from datetime import timedelta
+import logging
+
+from ..tools.sync_metrics import format_profile
+
+_logger = logging.getLogger(__name__)
+
+# Sync runs older than this are removed by the autovacuum
+SYNC_RUN_RETENTION_DAYS = 30
+
+# Catch-up chunks are sized to take about this long at the recent throughput
+CATCHUP_CHUNK_SECONDS = 60
+MIN_CATCHUP_CHUNK_HOURS = 0.25
+
+
+class VoicenterSyncRun(models.Model):
+    _name = 'voicenter.sync.run'
+    _description = 'Voicenter Sync Run'
+    _order = 'started_at desc, id desc'
+    _rec_name = 'started_at'
+
+    started_at = fields.Datetime('Started', required=True, index=True)
+    from_date = fields.Datetime('Synced From')
+    to_date = fields.Datetime('Synced To')
+    state = fields.Selection([
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', required=True, default='done')
+    error = fields.Text('Error')
+
+    # Volume
+    cdr_count = fields.Integer('CDRs Fetched', aggregator='sum')
+    created_count = fields.Integer('Created', aggregator='sum')
+    updated_count = fields.Integer('Updated', aggregator='sum')
+    skipped_count = fields.Integer('Unchanged', aggregator='sum')
+    failed_count = fields.Integer('Failed', aggregator='sum')
+    rows_per_second = fields.Float('CDRs/sec', digits=(16, 1), aggregator='avg')
+
+    # Wall time per stage (seconds)
+    duration = fields.Float('Total (s)', digits=(16, 3), aggregator='avg')
+    fetch_seconds = fields.Float('API Fetch (s)', digits=(16, 3), aggregator='avg')
+    match_seconds = fields.Float('Matching (s)', digits=(16, 3), aggregator='avg')
+    write_seconds = fields.Float('Writes (s)', digits=(16, 3), aggregator='avg')
+    identify_seconds = fields.Float('Follow-up Detection (s)', digits=(16, 3), aggregator='avg')
+
+    # SQL queries per stage
+    total_queries = fields.Integer('Total Queries', aggregator='avg')
+    match_queries = fields.Integer('Matching Queries', aggregator='avg')
+    write_queries = fields.Integer('Write Queries', aggregator='avg')
+    identify_queries = fields.Integer('Follow-up Detection Queries', aggregator='avg')
+
+    # Voicenter API
+    api_requests = fields.Integer('API Requests', aggregator='sum')
+    api_seconds = fields.Float('API Latency (s)', digits=(16, 3), aggregator='avg',
+                               help='Time spent waiting on Voicenter responses')
+    payload_kb = fields.Float('Payload (KB)', digits=(16, 1), aggregator='sum',
+                              help='Size of the decoded API responses')
+
+    profile_stats = fields.Text('Profile', help='cProfile output, when profiling is enabled in settings')
+
+    @api.model
+    def _is_profiling_enabled(self):
+        """Whether syncs run under cProfile"""
+        ICPSudo = self.env['ir.config_parameter'].sudo()
+        return ICPSudo.get_param('voicenter.sync_profile', 'False').lower() not in ('false', '0', 'no')
+
+    @api.model
+    def _record_run(self, from_date, to_date, metrics, client, stats, error=False, profiler=None):
+        """
+        Store the measurements of one sync_from_voicenter() call
+
+        The run is stored from its own cursor, so syncs that fail and roll
+        back are recorded too.
+
+        Args:
+            from_date: start of the synced range
+            to_date: end of the synced range
+            metrics: SyncMetrics of the sync
+            client: VoicenterClient used by the sync
+            stats: ingest statistics, see voicenter.call.log._ingest_cdrs()
+            error: error message when the sync failed
+            profiler: disabled cProfile.Profile of the sync, if any
+        """
+        duration = metrics.total_seconds
+        cdr_count = metrics.cdr_count
+        vals = {
+            'started_at': fields.Datetime.now() - timedelta(seconds=duration),
+            'from_date': from_date,
+            'to_date': to_date,
+            'state': 'failed' if error else 'done',
+            'error': error,
+            'cdr_count': cdr_count,
+            'created_count': stats['created'],
+            'updated_count': stats['updated'],
+            'skipped_count': stats['skipped'],
+            'failed_count': stats['failed'],
+            'rows_per_second': cdr_count / duration if duration else 0.0,
+            'duration': duration,
+            'fetch_seconds': metrics.seconds['fetch'],
+            'match_seconds': stats['match_seconds'],
+            'write_seconds': max(metrics.seconds['ingest'] - stats['match_seconds'], 0.0),
+            'identify_seconds': metrics.seconds['identify'],
+            'total_queries': metrics.total_queries,
+            'match_queries': stats['match_queries'],
+            'write_queries': max(metrics.queries['ingest'] - stats['match_queries'], 0),
+            'identify_queries': metrics.queries['identify'],
+            'api_requests': client.request_count,
+            'api_seconds': client.request_seconds,
+            'payload_kb': client.response_bytes / 1024,
+            'profile_stats': format_profile(profiler) if profiler else False,
+        }
+        try:
+            with self.env.registry.cursor() as cr:
+                self.with_env(self.env(cr=cr)).create(vals)
+        except Exception as e:
+            _logger.warning(f"Could not record Voicenter sync run: {e}")
+
+    @api.model
+    def _get_catchup_chunk_hours(self, max_hours):
+        """
+        Length of the chunks a catch-up sync is split into
+
+        Sized from the syncs of the last day: a chunk should hold about
+        as many calls as they ingested in CATCHUP_CHUNK_SECONDS, given the
+        call volume they saw.
+
+        Args:
+            max_hours: upper bound, also used without recent runs
+
+        Returns:
+            chunk length in hours
+        """
+        runs = self.search_fetch([
+            ('state', '=', 'done'),
+            ('cdr_count', '>', 0),
+            ('started_at', '>=', fields.Datetime.now() - timedelta(days=1)),
+        ], ['from_date', 'to_date', 'cdr_count', 'rows_per_second'], limit=50)
+        covered_hours = sum(
+            (run.to_date - run.from_date).total_seconds() / 3600
+            for run in runs if run.from_date and run.to_date)
+        if not covered_hours:
+            return max_hours
+
+        calls_per_hour = sum(runs.mapped('cdr_count')) / covered_hours
+        rows_per_second = sum(runs.mapped('rows_per_second')) / len(runs)
+        chunk_hours = rows_per_second * CATCHUP_CHUNK_SECONDS / calls_per_hour
+        return min(max(chunk_hours, MIN_CATCHUP_CHUNK_HOURS), max_hours)
+
+    @api.autovacuum
+    def _gc_old_runs(self):
+        """Remove sync runs past the retention period"""
+        limit_date = fields.Datetime.now() - timedelta(days=SYNC_RUN_RETENTION_DAYS)
+        self.search([('started_at', '<', limit_date)]).unlink()
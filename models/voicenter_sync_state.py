@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.tools import SQL
+from contextlib import contextmanager
+from datetime import timedelta
+import hashlib
+
+from psycopg2.errors import LockNotAvailable
+
+# First key of the PostgreSQL advisory locks guarding syncs; the second is the sync state id
+SYNC_LOCK_NAMESPACE = 0x56434e54
+# Seconds live ingest (polling, webhook queue, recording re-fetch) waits for the
+# sync lock; a backfill releases it between batches, and waiters get it in turn
+LIVE_SYNC_LOCK_WAIT = 30
+
+
+class VoicenterSyncState(models.Model):
+    _name = 'voicenter.sync.state'
+    _description = 'Voicenter Sync State'
+    _rec_name = 'name'
+
+    name = fields.Char('Account', required=True)
+    token_hash = fields.Char('Token Hash', required=True, index=True, copy=False,
+                             help='SHA-256 of the API token this state belongs to')
+
+    watermark = fields.Datetime('Synced Until',
+                                help='All calls up to this date have been fetched')
+    overlap_minutes = fields.Integer('Overlap (minutes)', default=10,
+                                     help='Each sync re-fetches this many minutes before the watermark '
+                                          'to pick up calls reported late by Voicenter')
+    last_sync_at = fields.Datetime('Last Sync')
+
+    _sql_constraints = [
+        ('token_hash_unique', 'UNIQUE(token_hash)', 'There is already a sync state for this API token!')
+    ]
+
+    @api.model
+    def _get_for_token(self, api_token):
+        """Return the sync state of an API token, creating it on first use"""
+        token_hash = hashlib.sha256(api_token.encode()).hexdigest()
+        state = self.search([('token_hash', '=', token_hash)], limit=1)
+        if not state:
+            state = self.create({
+                'name': f"Voicenter account {token_hash[:8]}",
+                'token_hash': token_hash,
+                'watermark': self._get_initial_watermark(),
+            })
+        return state
+
+    @api.model
+    def _get_initial_watermark(self):
+        """Start from the latest stored call when upgrading an existing database"""
+        last_call = self.env['voicenter.call.log'].search([], order='date desc', limit=1)
+        return last_call.date if last_call else False
+
+    def _get_sync_start(self, from_date):
+        """
+        Start of the next sync range
+
+        Args:
+            from_date: earliest date requested by the caller
+
+        Returns:
+            from_date, moved forward to the watermark minus the overlap window
+        """
+        self.ensure_one()
+        if not self.watermark:
+            return from_date
+        return max(from_date, self.watermark - timedelta(minutes=self.overlap_minutes))
+
+    def _advance_watermark(self, synced_from, synced_until):
+        """
+        Record that every call from synced_from to synced_until has been fetched
+
+        The watermark only moves when the range starts at or before it: a
+        range starting later leaves a gap that has not been fetched.
+
+        Args:
+            synced_from: start of the fetched range
+            synced_until: end of the fetched range
+        """
+        self.ensure_one()
+        if not self.watermark or synced_from <= self.watermark < synced_until:
+            self.watermark = synced_until
+
+    def _skip_watermark(self, skip_until):
+        """Give up fetching the calls before skip_until, moving the watermark over them"""
+        self.ensure_one()
+        if not self.watermark or self.watermark < skip_until:
+            self.watermark = skip_until
+
+    @contextmanager
+    def _sync_lock(self, wait=False):
+        """
+        Hold the PostgreSQL advisory lock of this account while ingesting
+
+        Every path that upserts the account's calls (polling, webhook
+        queue, backfill, recording re-fetch, dead letter retries) holds it,
+        so two workers never write the same calls concurrently. Holders
+        should keep it short: backfills take it once per batch, so live
+        ingest waiting for it gets in between. Holders must start a new
+        transaction once the lock is acquired: under REPEATABLE READ, the
+        calls committed by the previous holder are only visible to a
+        snapshot taken after that.
+
+        The session-level lock is taken on a dedicated cursor, so it
+        survives the commits of the holder and is released even when the
+        holder's own transaction is aborted.
+
+        Args:
+            wait: True to block until the lock is free, a number of seconds
+                to wait at most, or False to give up at once
+
+        Yields:
+            True when the lock was acquired, False when another worker holds it
+        """
+        self.ensure_one()
+        with self.env.registry.cursor() as lock_cr:
+            if wait is True:
+                lock_cr.execute(SQL("SELECT pg_advisory_lock(%s, %s)", SYNC_LOCK_NAMESPACE, self.id))
+                acquired = True
+            elif wait:
+                lock_cr.execute(SQL("SET LOCAL lock_timeout = %s", f"{int(wait * 1000)}ms"))
+                try:
+                    lock_cr.execute(SQL("SELECT pg_advisory_lock(%s, %s)", SYNC_LOCK_NAMESPACE, self.id))
+                    acquired = True
+                except LockNotAvailable:
+                    lock_cr.rollback()
+                    acquired = False
+            else:
+                lock_cr.execute(SQL("SELECT pg_try_advisory_lock(%s, %s)", SYNC_LOCK_NAMESPACE, self.id))
+                acquired = lock_cr.fetchone()[0]
+            # The lock outlives the transaction; don't stay idle in it
+            lock_cr.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    lock_cr.execute(SQL("SELECT pg_advisory_unlock(%s, %s)", SYNC_LOCK_NAMESPACE, self.id))
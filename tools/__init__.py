@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+from . import cdr
+from . import phone
+from . import recording_cache
+from . import sync_metrics
+from . import voicenter_api
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Fast mapping of Voicenter CDR dicts to call log values."""
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# (call log field, CDR key, default) for fields copied as they are
+CDR_FIELD_MAP = (
+    ('caller_number', 'CallerNumber', None),
+    ('target_number', 'TargetNumber', None),
+    ('caller_extension', 'CallerExtension', None),
+    ('target_extension', 'TargetExtension', None),
+    ('did', 'DID', None),
+    ('duration', 'Duration', 0),
+    ('ring_time', 'RingTime', 0),
+    ('call_type', 'Type', None),
+    ('cdr_type', 'CdrType', None),
+    ('dial_status', 'DialStatus', None),
+    ('record_url', 'RecordURL', None),
+    ('record_expect', 'RecordExpect', False),
+    ('price', 'Price', 0.0),
+)
+
+# (call log field, dimension model, CDR key of the dimension key, {dimension field: CDR key})
+# for values stored once in a lookup table and referenced by id
+CDR_DIMENSION_MAP = (
+    ('representative_id', 'voicenter.representative', 'RepresentativeCode',
+     {'name': 'RepresentativeName', 'user_name': 'UserName'}),
+    ('department_id', 'voicenter.department', 'DepartmentName', {'external_id': 'DepartmentId'}),
+    ('queue_id', 'voicenter.queue', 'QueueName', {}),
+    ('destination_id', 'voicenter.destination', 'TargetPrefixName', {}),
+)
+
+# (call log field, CDR key) for structured fields stored as JSON text
+CDR_JSON_FIELD_MAP = (
+    ('dtmf_data', 'DTMFData'),
+    ('custom_data', 'CustomData'),
+)
+
+# Fallback formats for dates datetime.fromisoformat() does not accept; never
+# reordered, as CDRs are parsed concurrently by the backfill threads
+DATE_FORMATS = ("%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d %H:%M:%S")
+
+
+def parse_cdr_date(date_str):
+    """
+    Parse a CDR date into a naive UTC datetime
+
+    Returns:
+        datetime, or False if the date cannot be parsed
+    """
+    if not date_str:
+        return False
+
+    # Fast path: ISO 8601, with 'T' or space separator and optional Z/offset
+    try:
+        call_date = datetime.fromisoformat(date_str[:-1] if date_str.endswith('Z') else date_str)
+    except (TypeError, ValueError):
+        call_date = _parse_cdr_date_with_formats(date_str)
+        if not call_date:
+            _logger.warning(f"Could not parse date: {date_str}")
+            return False
+
+    if call_date.tzinfo:
+        call_date = call_date.astimezone(timezone.utc).replace(tzinfo=None)
+    return call_date
+
+
+def _parse_cdr_date_with_formats(date_str):
+    for date_format in DATE_FORMATS:
+        try:
+            call_date = datetime.strptime(date_str, date_format)
+        except (TypeError, ValueError):
+            continue
+        return call_date
+    return False
+
+
+def get_cdr_hash(cdr):
+    """Content hash of a raw CDR, used to skip unchanged re-synced calls"""
+    content = json.dumps(cdr, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(content.encode()).hexdigest()
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Phone number normalization shared by call matching and the phone keys
+stored on contacts and leads."""
+
+ISRAEL_COUNTRY_CODE = '972'
+
+
+def normalize_phone(number):
+    """
+    Return the lookup key for a phone number
+
+    The key keeps digits only and drops the international '00' prefix.
+    Israeli numbers are stored in national form, so '+972-50-1234567',
+    '972501234567' and '050-1234567' all map to '0501234567'.
+
+    Returns:
+        str key, or False if the number contains no digits
+    """
+    if not number:
+        return False
+
+    digits = ''.join(char for char in str(number) if char.isdigit())
+    if digits.startswith('00'):
+        digits = digits[2:]
+
+    # 972 followed by a national number of at least 8 digits
+    if digits.startswith(ISRAEL_COUNTRY_CODE) and len(digits) >= 11:
+        digits = '0' + digits[3:].lstrip('0')
+
+    return digits or False
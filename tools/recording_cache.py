@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Size-bounded on-disk cache of call recordings.
+
+Recordings are stored under the database filestore, one file per call.
+The modification time of a file is its last use: reading a recording
+touches it, and eviction removes the least recently used files first
+until the cache fits its size limit.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+
+from .voicenter_api import get_session
+
+_logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class RecordingCache:
+    """Recordings of one database, keyed on the Voicenter call ID"""
+
+    def __init__(self, root, max_bytes, timeout=60):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+    def path_for(self, call_id):
+        """Cache file of a call, sharded on the hash of its call ID"""
+        digest = hashlib.sha1(str(call_id).encode()).hexdigest()
+        return os.path.join(self.root, digest[:2], digest)
+
+    def get(self, call_id):
+        """
+        Path of the cached recording of a call, marked as used
+
+        Returns:
+            path, or None when the recording is not cached
+        """
+        path = self.path_for(call_id)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def contains(self, call_id):
+        """Whether the recording of a call is cached, without marking it as used"""
+        return os.path.exists(self.path_for(call_id))
+
+    def fetch(self, call_id, url, last_used=None):
+        """
+        Download a recording into the cache, streaming it to disk
+
+        The file is written under a temporary name and moved in place, so
+        readers never see a partial recording.
+
+        Args:
+            call_id: Voicenter call ID
+            url: recording URL
+            last_used: timestamp the recording counts as last used at for
+                eviction, now by default
+
+        Returns:
+            path of the cached recording
+
+        Raises:
+            requests.exceptions.RequestException when the download fails
+        """
+        path = self.path_for(call_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with get_session().get(url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as tmp_file:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        tmp_file.write(chunk)
+                if last_used is not None:
+                    os.utime(tmp_path, (last_used, last_used))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        return path
+
+    def _scan(self):
+        """
+        List the cached recordings
+
+        Returns:
+            (entries, total) where entries are (mtime, size, path) tuples and
+            total is their size in bytes
+        """
+        entries = []
+        total = 0
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def size(self):
+        """Total size of the cached recordings, in bytes"""
+        return self._scan()[1]
+
+    def evict(self):
+        """
+        Remove least recently used recordings until the cache fits its limit
+
+        Returns:
+            number of recordings removed
+        """
+        entries, total = self._scan()
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            _logger.info(f"Evicted {removed} recordings from the Voicenter recording cache")
+        return removed
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Wall time and SQL query accounting for the stages of a sync."""
+from collections import defaultdict
+from contextlib import contextmanager
+import io
+import pstats
+import time
+
+
+class SyncMetrics:
+    """Accumulates wall time and SQL query counts per named stage"""
+
+    def __init__(self, cr):
+        self.cr = cr
+        self.started = time.perf_counter()
+        self.start_queries = cr.sql_log_count
+        self.seconds = defaultdict(float)
+        self.queries = defaultdict(int)
+        self.cdr_count = 0
+
+    @contextmanager
+    def stage(self, name):
+        """Count the time and queries spent in the block towards a stage"""
+        started = time.perf_counter()
+        queries = self.cr.sql_log_count
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - started
+            self.queries[name] += self.cr.sql_log_count - queries
+
+    @property
+    def total_seconds(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def total_queries(self):
+        return self.cr.sql_log_count - self.start_queries
+
+
+def format_profile(profiler, limit=50):
+    """Top functions of a cProfile.Profile by cumulative time, as text"""
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(limit)
+    return output.getvalue()
+
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""HTTP client for the Voicenter API.
+
+Requests go through one pooled requests.Session per worker thread, so
+connections (and their TLS handshakes) are reused across syncs. Timeouts,
+connection errors, 5xx responses and rate limiting are retried with
+exponential backoff and jitter before an error is raised.
+"""
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from odoo import _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+VOICENTER_API_URL = 'https://api.voicenter.com'
+CDR_ENDPOINT = 'hub/cdr/'
+
+_local = threading.local()
+
+
+class VoicenterApiError(UserError):
+    """Raised when the Voicenter API cannot be reached or reports an error"""
+
+
+def get_session():
+    """Return the pooled session of the current worker thread"""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+        _local.session = session
+    return session
+
+
+class VoicenterClient:
+    """Client for the Voicenter API endpoints used by the integration"""
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, api_token, base_url=VOICENTER_API_URL, timeout=30,
+                 max_retries=4, backoff_base=1.0, backoff_max=30.0):
+        self.api_token = api_token
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Totals over the client's lifetime, reported by sync runs
+        self.request_count = 0
+        self.request_seconds = 0.0
+        self.response_bytes = 0
+
+    def fetch_cdrs(self, from_date, to_date, fields_list):
+        """
+        Fetch the CDRs of a date range
+
+        Args:
+            from_date: start of the range (naive UTC datetime)
+            to_date: end of the range (naive UTC datetime)
+            fields_list: CDR fields to return
+
+        Returns:
+            list of CDR dicts, oldest first
+        """
+        # Format dates for API (ISO 8601, GMT 0)
+        payload = {
+            "code": self.api_token,
+            "fields": fields_list,
+            "search": {
+                "fromdate": from_date.strftime("%Y-%m-%dT%H:%M:%S"),
+                "todate": to_date.strftime("%Y-%m-%dT%H:%M:%S")
+            },
+            "sort": [{
+                "field": "date",
+                "order": "asc"
+            }]
+        }
+        data = self.post(CDR_ENDPOINT, payload)
+        return data.get('CDR_LIST', [])
+
+    def post(self, endpoint, payload):
+        """
+        POST a JSON payload, retrying transient failures
+
+        Returns:
+            decoded JSON response
+
+        Raises:
+            VoicenterApiError once retries are exhausted or on a
+            non-retryable failure
+        """
+        url = f"{self.base_url}/{endpoint}"
+        session = get_session()
+
+        for attempt in range(self.max_retries + 1):
+            retries_left = attempt < self.max_retries
+            try:
+                _logger.info(f"Making API request to {url}")
+                started = time.perf_counter()
+                response = session.post(url, json=payload, timeout=self.timeout)
+                self.request_count += 1
+                self.request_seconds += time.perf_counter() - started
+                self.response_bytes += len(response.content)
+            except requests.exceptions.Timeout:
+                if retries_left:
+                    self._wait(attempt, reason="timeout")
+                    continue
+                error_msg = "Voicenter API request timed out. Please check your internet connection or try again later."
+                _logger.error(f"API timeout: {error_msg}")
+                raise VoicenterApiError(_(error_msg))
+            except requests.exceptions.ConnectionError:
+                if retries_left:
+                    self._wait(attempt, reason="connection error")
+                    continue
+                error_msg = "Could not connect to Voicenter API. Please check your internet connection."
+                _logger.error(f"Connection error: {error_msg}")
+                raise VoicenterApiError(_(error_msg))
+            except requests.exceptions.RequestException as e:
+                error_msg = f"Network error while syncing from Voicenter: {str(e)}"
+                _logger.error(error_msg)
+                raise VoicenterApiError(_(error_msg))
+
+            if response.status_code in self.RETRY_STATUS_CODES and retries_left:
+                self._wait(attempt, reason=f"HTTP {response.status_code}",
+                           retry_after=response.headers.get('Retry-After'))
+                continue
+
+            try:
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.HTTPError as e:
+                error_msg = f"Network error while syncing from Voicenter: {str(e)}"
+                _logger.error(error_msg)
+                raise VoicenterApiError(_(error_msg))
+            except ValueError as e:
+                error_msg = f"Invalid response from Voicenter API: {str(e)}"
+                _logger.error(error_msg)
+                raise VoicenterApiError(_(error_msg))
+
+            if data.get('ERROR_NUMBER', 0) != 0:
+                error_msg = f"Voicenter API error: {data.get('ERROR_DESCRIPTION', 'Unknown error')}"
+                _logger.error(error_msg)
+                raise VoicenterApiError(_(error_msg))
+
+            return data
+
+    def _wait(self, attempt, reason, retry_after=None):
+        """Sleep before the next attempt: Retry-After if given, else exponential backoff with full jitter"""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        delay = min(delay, self.backoff_max)
+        _logger.warning(f"Voicenter API {reason}, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+        time.sleep(delay)